@@ -5,6 +5,12 @@ Run this file to see all examples in action.
 
 import math
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 # ============================================================
 # Week 1-1: Variables & Coordinates
 # ============================================================
@@ -112,6 +118,52 @@ print(f"cos(0°) = {math.cos(math.radians(0))}")
 print("\n--- Haversine Formula ---")
 
 
+EARTH_RADIUS_KM = 6371  # Earth's radius in km
+NUMPY_BATCH_MIN = 64  # Below this, plain Python beats NumPy's setup cost
+
+
+def haversine_batch(origins, destinations):
+    """
+    Calculate many great-circle distances in one call.
+
+    origins[k] is paired with destinations[k]. Uses NumPy when it is
+    installed and the batch is big enough; otherwise a plain-Python loop
+    that gives the same results.
+
+    Args:
+        origins: List of (latitude, longitude) tuples
+        destinations: List of (latitude, longitude) tuples, same length
+
+    Returns:
+        List of distances in kilometers
+    """
+    if len(origins) != len(destinations):
+        raise ValueError("origins and destinations must have the same length")
+
+    if NUMPY_AVAILABLE and len(origins) >= NUMPY_BATCH_MIN:
+        p1 = np.radians(np.asarray(origins, dtype=float))
+        p2 = np.radians(np.asarray(destinations, dtype=float))
+        dlat = p2[:, 0] - p1[:, 0]
+        dlon = p2[:, 1] - p1[:, 1]
+        a = np.sin(dlat / 2) ** 2 + np.cos(p1[:, 0]) * np.cos(p2[:, 0]) * np.sin(dlon / 2) ** 2
+        c = 2 * np.arcsin(np.sqrt(a))
+        return (EARTH_RADIUS_KM * c).tolist()
+
+    distances = []
+    for (lat1, lon1), (lat2, lon2) in zip(origins, destinations):
+        lat1, lon1 = math.radians(lat1), math.radians(lon1)
+        lat2, lon2 = math.radians(lat2), math.radians(lon2)
+
+        dlat = lat2 - lat1
+        dlon = lon2 - lon1
+
+        a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+        c = 2 * math.asin(math.sqrt(a))
+        distances.append(EARTH_RADIUS_KM * c)
+
+    return distances
+
+
 def haversine(coord1, coord2):
     """
     Calculate the great-circle distance between two points on Earth.
@@ -123,18 +175,7 @@ def haversine(coord1, coord2):
     Returns:
         Distance in kilometers
     """
-    R = 6371  # Earth's radius in km
-
-    lat1, lon1 = math.radians(coord1[0]), math.radians(coord1[1])
-    lat2, lon2 = math.radians(coord2[0]), math.radians(coord2[1])
-
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-
-    a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
-    c = 2 * math.asin(math.sqrt(a))
-
-    return R * c
+    return haversine_batch([coord1], [coord2])[0]
 
 
 # Test distances
@@ -198,10 +239,13 @@ walking_tour = [
 print("Walking Tour Route:")
 total_distance = 0
 
-for i in range(len(walking_tour) - 1):
-    name1, lat1, lon1 = walking_tour[i]
-    name2, lat2, lon2 = walking_tour[i + 1]
-    dist = haversine((lat1, lon1), (lat2, lon2))
+# One batch call for every leg of the tour
+stops = [(lat, lon) for _, lat, lon in walking_tour]
+leg_distances = haversine_batch(stops[:-1], stops[1:])
+
+for i, dist in enumerate(leg_distances):
+    name1 = walking_tour[i][0]
+    name2 = walking_tour[i + 1][0]
     total_distance += dist
     print(f"  {i + 1}. {name1} → {name2}: {dist:.2f} km")
 
@@ -5,18 +5,45 @@ Run this file to see all examples in action.
 
 import math
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 # ============================================================
-# Haversine function (from Week 1)
+# Haversine functions (from Week 1)
 # ============================================================
 
+R = 6371
+NUMPY_BATCH_MIN = 64
+
+
+def haversine_batch(origins, destinations):
+    """Distances in km for each (origins[k], destinations[k]) pair, in one call."""
+    if len(origins) != len(destinations):
+        raise ValueError("origins and destinations must have the same length")
+
+    if NUMPY_AVAILABLE and len(origins) >= NUMPY_BATCH_MIN:
+        p1 = np.radians(np.asarray(origins, dtype=float))
+        p2 = np.radians(np.asarray(destinations, dtype=float))
+        dlat, dlon = p2[:, 0] - p1[:, 0], p2[:, 1] - p1[:, 1]
+        a = np.sin(dlat/2)**2 + np.cos(p1[:, 0]) * np.cos(p2[:, 0]) * np.sin(dlon/2)**2
+        return (R * 2 * np.arcsin(np.sqrt(a))).tolist()
+
+    distances = []
+    for coord1, coord2 in zip(origins, destinations):
+        lat1, lon1 = math.radians(coord1[0]), math.radians(coord1[1])
+        lat2, lon2 = math.radians(coord2[0]), math.radians(coord2[1])
+        dlat, dlon = lat2 - lat1, lon2 - lon1
+        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
+        distances.append(R * 2 * math.asin(math.sqrt(a)))
+    return distances
+
+
 def haversine(coord1, coord2):
     """Calculate distance between two coordinates in km."""
-    R = 6371
-    lat1, lon1 = math.radians(coord1[0]), math.radians(coord1[1])
-    lat2, lon2 = math.radians(coord2[0]), math.radians(coord2[1])
-    dlat, dlon = lat2 - lat1, lon2 - lon1
-    a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-    return R * 2 * math.asin(math.sqrt(a))
+    return haversine_batch([coord1], [coord2])[0]
 
 
 # ============================================================
@@ -101,8 +128,7 @@ route = [
 ]
 
 total = 0
-for i in range(len(route) - 1):
-    dist = haversine(route[i], route[i + 1])
+for i, dist in enumerate(haversine_batch(route[:-1], route[1:])):
     total += dist
     print(f"Segment {i + 1}: {dist:.3f} km")
 
@@ -225,8 +251,9 @@ for p in places:
     dist = haversine(my_location, p["coords"])
     print(f"  {p['name']}: {dist:.2f} km")
 
-# Filter to within 1km
-nearby = [(p, haversine(my_location, p["coords"])) for p in places]
+# Filter to within 2km (one batch call for all places)
+distances = haversine_batch([my_location] * len(places), [p["coords"] for p in places])
+nearby = list(zip(places, distances))
 nearby = [(p, d) for p, d in nearby if d <= 2.0]
 nearby.sort(key=lambda x: x[1])
 
@@ -251,8 +278,8 @@ print("\n--- Combined: Find Best Nearby ---")
 def find_best_nearby(places, center, max_km, min_rating=4.0):
     """Find highly-rated places within distance."""
     results = []
-    for p in places:
-        dist = haversine(center, p["coords"])
+    distances = haversine_batch([center] * len(places), [p["coords"] for p in places])
+    for p, dist in zip(places, distances):
         if dist <= max_km and p.get("rating", 0) >= min_rating:
             results.append({**p, "distance_km": round(dist, 3)})
 
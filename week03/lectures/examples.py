@@ -161,45 +161,301 @@ print(f"  Loaded {len(data)} items")
 
 print("\n--- Part 7: Place Database ---")
 
-class PlaceDatabase:
-    """A simple JSON-based place database."""
+_decoder = json.JSONDecoder()
+
+
+def _project(place, fields):
+    """Keep only the requested keys (all keys if fields is None)."""
+    if fields is None:
+        return place
+    return {k: place[k] for k in fields if k in place}
+
+
+def iter_places(filename, fields=None, chunk_size=65536):
+    """
+    Yield place dicts from a file one at a time.
+
+    Works with JSON Lines (one object per line) and with a normal JSON
+    file holding a top-level array, which is parsed piece by piece.
+    Only one place is in memory at a time, so huge files are fine.
+
+    Args:
+        filename: Path to a .json or .jsonl file
+        fields: Optional list of keys to keep, e.g. ["name", "coords"]
+        chunk_size: How many characters to read at once
+    """
+    with open(filename, "r", encoding="utf-8") as f:
+        buffer = f.read(chunk_size)
+        start = len(buffer) - len(buffer.lstrip())
+
+        if not buffer[start:start + 1] == "[":
+            # JSON Lines: each non-empty line is one place
+            f.seek(0)
+            for line in f:
+                if line.strip():
+                    yield _project(json.loads(line), fields)
+            return
+
+        pos = start + 1
+        while True:
+            # Skip whitespace and the commas between items
+            while True:
+                while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                    pos += 1
+                if pos < len(buffer):
+                    break
+                more = f.read(chunk_size)
+                if not more:
+                    raise json.JSONDecodeError("Unterminated array", buffer, pos)
+                buffer, pos = more, 0
+
+            if buffer[pos] == "]":
+                return
+
+            try:
+                place, end = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # The item is cut off at the end of the buffer: read more
+                more = f.read(chunk_size)
+                if not more:
+                    raise
+                buffer, pos = buffer[pos:] + more, 0
+                continue
+
+            yield _project(place, fields)
+            pos = end
+            # Drop the consumed part so the buffer stays small
+            if pos > chunk_size:
+                buffer, pos = buffer[pos:], 0
+
+
+def save_places_jsonl(places, filename):
+    """Write places as JSON Lines (one place per line)."""
+    with open(filename, "w", encoding="utf-8") as f:
+        for place in places:
+            f.write(json.dumps(place, ensure_ascii=False) + "\n")
+
 
-    def __init__(self, filename):
+class PlaceDatabase:
+    """
+    A simple JSON-based place database.
+
+    By default every change rewrites the whole JSON file. With
+    journal=True the file is JSON Lines instead: add() appends one
+    {"op": "add", "place": {...}} line and delete() appends a
+    {"op": "del", "name": ...} tombstone, so writes cost O(1) no matter how
+    big the database is. compact() rewrites only the live places.
+    Opening an old JSON-array file with journal=True converts it.
+
+    Places are kept in hash indexes by name and id (and by category if
+    index_category=True), so find(), get() and delete() do not scan.
+    Because of that, `places` and all() return a fresh list each time:
+    appending to it changes nothing, so use add() instead.
+    """
+
+    def __init__(self, filename, journal=False, compact_after=1000,
+                 index_category=False):
         self.filename = filename
-        self.places = self._load()
+        self.journal = journal
+        self.compact_after = compact_after
+        self.dead = 0   # Journal lines that no longer hold a live place
+
+        self._rows = {}      # row number -> place, in insertion order
+        self._next_row = 0
+        self.by_name = {}    # name -> {row: place}
+        self.by_id = {}      # id -> {row: place}
+        self.by_category = {} if index_category else None
+        self._load()
+
+    @property
+    def places(self):
+        """A copy of all places, in insertion order (O(n) per access)."""
+        return list(self._rows.values())
+
+    def _check_keys(self, place):
+        """Raise before any index changes if a place cannot be indexed."""
+        keys = [place.get("name")]
+        if "id" in place:
+            keys.append(place["id"])
+        if self.by_category is not None:
+            keys.append(place.get("category"))
+        for key in keys:
+            try:
+                hash(key)
+            except TypeError:
+                raise TypeError(f"Cannot index {key!r} (in place {place.get('name')!r})")
+
+    def _insert(self, place):
+        self._check_keys(place)
+        row = self._next_row
+        self._next_row += 1
+        self._rows[row] = place
+        self.by_name.setdefault(place.get("name"), {})[row] = place
+        if "id" in place:
+            self.by_id.setdefault(place["id"], {})[row] = place
+        if self.by_category is not None:
+            self.by_category.setdefault(place.get("category"), {})[row] = place
+
+    def _remove_name(self, name):
+        """Drop every place with this name; return how many were removed."""
+        rows = self.by_name.pop(name, {})
+        for row, place in rows.items():
+            del self._rows[row]
+            if "id" in place:
+                same_id = self.by_id[place["id"]]
+                del same_id[row]
+                if not same_id:
+                    del self.by_id[place["id"]]
+            if self.by_category is not None:
+                same = self.by_category[place.get("category")]
+                del same[row]
+                if not same:
+                    del self.by_category[place.get("category")]
+        return len(rows)
 
     def _load(self):
         if not os.path.exists(self.filename):
-            return []
+            return
+        if self.journal:
+            self._replay()
+            return
         try:
-            with open(self.filename, "r", encoding="utf-8") as f:
-                return json.load(f)
+            places = list(iter_places(self.filename))
         except:
-            return []
+            places = []
+        for place in places:
+            self._insert(place)
+
+    def _replay(self):
+        """Rebuild the indexes by replaying the journal."""
+        with open(self.filename, "rb") as f:
+            first = f.read(4096).lstrip()[:1]
+        if first == b"[":
+            # An old JSON-array file: move it over to JSON Lines
+            for place in iter_places(self.filename):
+                self._insert(place)
+            self._save()
+            return
+
+        good_end = 0
+        torn = False
+        with open(self.filename, "rb") as f:
+            for number, line in enumerate(f, 1):
+                if not line.endswith(b"\n"):
+                    torn = True   # Half-written last line from a crash
+                    break
+                if line.strip():
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        raise ValueError(f"{self.filename}: bad journal line {number}")
+                    op = record.get("op") if isinstance(record, dict) else None
+                    if op == "add" and isinstance(record.get("place"), dict):
+                        self._insert(record["place"])
+                    elif op == "del" and "name" in record:
+                        self.dead += 1 + self._remove_name(record["name"])
+                    else:
+                        raise ValueError(f"{self.filename}: bad journal line {number}")
+                good_end += len(line)
+
+        if torn:
+            if good_end == 0:
+                raise ValueError(f"{self.filename}: not a journal file")
+            # Cut off the torn line so the next append starts clean
+            with open(self.filename, "r+b") as f:
+                f.truncate(good_end)
+
+    def _append(self, records):
+        with open(self.filename, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
 
     def _save(self):
-        with open(self.filename, "w", encoding="utf-8") as f:
-            json.dump(self.places, f, indent=2, ensure_ascii=False)
+        # Write to a temp file, then swap it in: a crash leaves the old file
+        tmp = self.filename + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            if self.journal:
+                for p in self._rows.values():
+                    f.write(json.dumps({"op": "add", "place": p}, ensure_ascii=False) + "\n")
+            else:
+                json.dump(self.places, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.filename)
+
+    def compact(self):
+        """Rewrite the journal with only the live places."""
+        self._save()
+        self.dead = 0
+
+    def _maybe_compact(self):
+        if self.dead > max(self.compact_after, len(self._rows)):
+            self.compact()
 
     def add(self, place):
-        self.places.append(place)
-        self._save()
+        self.add_many([place])
+
+    def add_many(self, places):
+        """Add several places with a single write."""
+        places = list(places)
+        for place in places:
+            self._check_keys(place)
+        for place in places:
+            self._insert(place)
+        if self.journal:
+            self._append({"op": "add", "place": p} for p in places)
+        else:
+            self._save()
 
     def find(self, name):
-        for p in self.places:
-            if p.get("name") == name:
-                return p
-        return None
+        rows = self.by_name.get(name)
+        if not rows:
+            return None
+        return next(iter(rows.values()))
+
+    def get(self, place_id):
+        """Look up a place by its "id" field."""
+        rows = self.by_id.get(place_id)
+        if not rows:
+            return None
+        return next(iter(rows.values()))
+
+    def find_by_category(self, category):
+        """All places in a category (needs index_category=True)."""
+        if self.by_category is None:
+            raise ValueError("Category index is off: use index_category=True")
+        return list(self.by_category.get(category, {}).values())
 
     def delete(self, name):
-        self.places = [p for p in self.places if p.get("name") != name]
-        self._save()
+        removed = self._remove_name(name)
+        if self.journal:
+            self._append([{"op": "del", "name": name}])
+            self.dead += 1 + removed
+            self._maybe_compact()
+        else:
+            self._save()
 
     def all(self):
         return self.places
 
+    def iter_all(self, fields=None):
+        """
+        Iterate over places, optionally keeping only some fields.
+
+        In the default JSON mode this streams straight from the file. In
+        journal mode it walks the rows already in memory (the journal may
+        hold deleted places, so the file alone is not the answer).
+        """
+        if self.journal:
+            return (_project(p, fields) for p in self._rows.values())
+        if not os.path.exists(self.filename):
+            return iter([])
+        return iter_places(self.filename, fields)
+
     def count(self):
-        return len(self.places)
+        return len(self._rows)
 
 
 # Demo
@@ -223,6 +479,28 @@ for p in db.all():
 db2 = PlaceDatabase("demo_db.json")
 print(f"Reloaded from file: {db2.count()} places")
 
+# Journal mode: fast bulk imports
+jdb = PlaceDatabase("demo_journal.jsonl", journal=True)
+jdb.add_many({"name": f"Stall {i}", "rating": 4.0} for i in range(1000))
+jdb.delete("Stall 0")
+jdb.add({"name": "Raohe Night Market", "rating": 4.5})
+
+# Simulate a crash in the middle of a write
+with open("demo_journal.jsonl", "a", encoding="utf-8") as f:
+    f.write('{"name": "Half writ')
+
+jdb = PlaceDatabase("demo_journal.jsonl", journal=True)
+print(f"Journal after crash: {jdb.count()} places, {jdb.dead} dead lines")
+jdb.compact()
+print(f"After compact: {os.path.getsize('demo_journal.jsonl')} bytes")
+
+# Indexed lookups: no scanning, even with many places
+idb = PlaceDatabase("demo_journal.jsonl", journal=True, index_category=True)
+idb.add({"id": 9001, "name": "Shilin Night Market", "category": "market"})
+print(f"By name: {idb.find('Raohe Night Market')}")
+print(f"By id: {idb.get(9001)}")
+print(f"Markets: {[p['name'] for p in idb.find_by_category('market')]}")
+
 # ============================================================
 # Part 8: Complex JSON (API-like)
 # ============================================================
@@ -283,12 +561,40 @@ print(f"Reloaded coords type: {type(reloaded['coords'])}")
 reloaded["coords"] = tuple(reloaded["coords"])
 print(f"After conversion: {type(reloaded['coords'])}")
 
+# ============================================================
+# Part 10: Streaming Large Files
+# ============================================================
+
+print("\n--- Part 10: Streaming Large Files ---")
+
+# Make a "big" export in both formats
+big = [
+    {"name": f"Place {i}", "coords": [25.0 + i / 1e5, 121.5], "rating": 4.0,
+     "tags": ["food", "night market"], "description": "x" * 200}
+    for i in range(20000)
+]
+with open("big_places.json", "w", encoding="utf-8") as f:
+    json.dump(big, f)
+save_places_jsonl(big, "big_places.jsonl")
+del big
+
+# Stream: one place at a time, keeping only the fields we need
+for filename in ["big_places.json", "big_places.jsonl"]:
+    count = 0
+    best = None
+    for p in iter_places(filename, fields=["name", "rating"]):
+        count += 1
+        if best is None or p["rating"] > best["rating"]:
+            best = p
+    print(f"{filename}: streamed {count} places, first best: {best}")
+
 # ============================================================
 # Cleanup
 # ============================================================
 
 print("\n--- Cleanup ---")
-for f in ["example.txt", "places.json", "invalid.json", "demo_db.json"]:
+for f in ["example.txt", "places.json", "invalid.json", "demo_db.json",
+          "demo_journal.jsonl", "big_places.json", "big_places.jsonl"]:
     if os.path.exists(f):
         os.remove(f)
         print(f"Removed: {f}")
@@ -12,10 +12,16 @@ Note: Some examples make real API calls and require internet connection.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+import asyncio
+import threading
 import time
 import json
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
+import sqlite3
 from pathlib import Path
+from urllib.parse import urlparse
 
 
 # =============================================================================
@@ -26,6 +32,50 @@ from pathlib import Path
 USER_AGENT = "CS101-Examples/1.0 (cs101@university.edu)"
 
 
+# =============================================================================
+# Shared HTTP Session
+# =============================================================================
+
+# One requests.Session for every API helper. Connections stay open between
+# calls (keep-alive), so only the first request to a host pays for the
+# TCP/TLS handshake.
+DEFAULT_TIMEOUT = 10  # seconds
+_session = None
+
+
+def create_session(pool_size: int = 10, user_agent: str = USER_AGENT):
+    """Create a Session with a bounded connection pool and default headers."""
+    session = requests.Session()
+    session.headers.update({
+        "User-Agent": user_agent,
+        "Accept-Encoding": "gzip, deflate",
+    })
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session():
+    """Return the shared session, creating it on first use."""
+    global _session
+    if _session is None:
+        _session = create_session()
+    return _session
+
+
+def set_session(session) -> None:
+    """Replace the shared session (e.g. with a fake one in tests)."""
+    global _session
+    _session = session
+
+
+def http_get(url: str, params: dict | None = None, headers: dict | None = None,
+             timeout: float = DEFAULT_TIMEOUT):
+    """GET through the shared session, with a default timeout."""
+    return get_session().get(url, params=params, headers=headers, timeout=timeout)
+
+
 # =============================================================================
 # Example 1: Basic GET Request
 # =============================================================================
@@ -171,7 +221,7 @@ def geocode(place_name: str) -> dict | None:
     }
 
     try:
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = http_get(url, params=params, headers=headers, timeout=10)
 
         if response.status_code == 200:
             results = response.json()
@@ -246,7 +296,7 @@ def reverse_geocode(lat: float, lon: float) -> str | None:
     }
 
     try:
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = http_get(url, params=params, headers=headers, timeout=10)
 
         if response.status_code == 200:
             result = response.json()
@@ -335,23 +385,69 @@ def example_error_handling():
 # =============================================================================
 
 class RateLimiter:
-    """Simple rate limiter for API calls."""
+    """
+    Token-bucket rate limiter for API calls.
+
+    The bucket holds up to `burst` tokens and refills at `calls_per_second`.
+    Each call takes one token; when the bucket is empty, the caller waits
+    until the next token arrives. With burst=1 this is the classic
+    "at least 1/rate seconds between calls".
+
+    Uses time.monotonic() (immune to clock changes) and a lock, so one
+    limiter can be shared by several threads. Async code should use
+    `await limiter.acquire()` instead of wait().
+    """
 
-    def __init__(self, calls_per_second: float = 1.0):
-        self.min_interval = 1.0 / calls_per_second
-        self.last_call = 0
+    def __init__(self, calls_per_second: float = 1.0, burst: int = 1):
+        self.rate = calls_per_second
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how long the caller must wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1  # may go negative: later callers queue behind us
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
 
     def wait(self):
         """Wait if needed to respect rate limit."""
-        now = time.time()
-        elapsed = now - self.last_call
-
-        if elapsed < self.min_interval:
-            sleep_time = self.min_interval - elapsed
+        sleep_time = self.reserve()
+        if sleep_time > 0:
             print(f"  Rate limiting: waiting {sleep_time:.2f}s...")
             time.sleep(sleep_time)
 
-        self.last_call = time.time()
+    async def acquire(self):
+        """Async version of wait(): yields to other tasks instead of blocking."""
+        sleep_time = self.reserve()
+        if sleep_time > 0:
+            await asyncio.sleep(sleep_time)
+
+
+# Requests per second (and burst) allowed per host. Unknown hosts get 1/s.
+# A self-hosted Nominatim mirror can be added here with a much higher limit,
+# e.g. "nominatim.internal": (50, 10)
+HOST_RATE_LIMITS = {
+    "nominatim.openstreetmap.org": (1, 1),
+    "router.project-osrm.org": (2, 2),
+}
+
+_host_limiters: dict[str, RateLimiter] = {}
+_host_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(url: str) -> RateLimiter:
+    """Return the shared RateLimiter for the host of `url`."""
+    host = urlparse(url).hostname or url
+    with _host_limiters_lock:
+        if host not in _host_limiters:
+            rate, burst = HOST_RATE_LIMITS.get(host, (1, 1))
+            _host_limiters[host] = RateLimiter(calls_per_second=rate, burst=burst)
+        return _host_limiters[host]
 
 
 def example_rate_limiter():
@@ -374,6 +470,15 @@ def example_rate_limiter():
         response = requests.get(url, timeout=5)
         print(f"  Status: {response.status_code}")
 
+    # A bucket with burst capacity lets a few calls through immediately,
+    # then settles to the steady rate
+    print("\nToken bucket: 5 calls/s with a burst of 3")
+    limiter = RateLimiter(calls_per_second=5, burst=3)
+    start = time.monotonic()
+    for i in range(6):
+        limiter.wait()
+        print(f"  call {i + 1} at {time.monotonic() - start:.2f}s")
+
 
 # =============================================================================
 # Example 9: Nominatim Client with Rate Limiting
@@ -386,13 +491,14 @@ class NominatimClient:
 
     def __init__(self, user_agent: str):
         self.headers = {"User-Agent": user_agent}
-        self.rate_limiter = RateLimiter(calls_per_second=1)
+        # Shared with every other client talking to the same host
+        self.rate_limiter = get_rate_limiter(self.BASE_URL)
 
     def search(self, query: str, limit: int = 5) -> list[dict]:
         """Search for places by name."""
         self.rate_limiter.wait()
 
-        response = requests.get(
+        response = http_get(
             f"{self.BASE_URL}/search",
             params={"q": query, "format": "json", "limit": limit},
             headers=self.headers,
@@ -407,7 +513,7 @@ class NominatimClient:
         """Reverse geocode coordinates to address."""
         self.rate_limiter.wait()
 
-        response = requests.get(
+        response = http_get(
             f"{self.BASE_URL}/reverse",
             params={"lat": lat, "lon": lon, "format": "json"},
             headers=self.headers,
@@ -449,16 +555,192 @@ def example_nominatim_client():
 # Example 10: Caching API Responses
 # =============================================================================
 
+class SQLiteCache:
+    """
+    Persistent key/value cache stored in a single SQLite file.
+
+    - Every entry has its own expiry time (TTL)
+    - The total size is capped; when full, the least recently used
+      entries are evicted first
+    - Several processes can share one cache file safely (SQLite handles
+      the locking; WAL mode lets readers and a writer work at once)
+    - The total size lives in a meta row kept up to date by triggers, so
+      a write never has to add up the whole table
+    """
+
+    def __init__(self, path: str | Path, max_bytes: int = 50_000_000,
+                 default_ttl: float | None = 7 * 24 * 3600,
+                 sweep_interval: float = 60):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.sweep_interval = sweep_interval
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._last_sweep = 0.0
+
+        # isolation_level=None: we issue BEGIN/COMMIT ourselves
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key         TEXT PRIMARY KEY,
+                    value       TEXT NOT NULL,
+                    size        INTEGER NOT NULL,
+                    expires_at  REAL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_lru ON entries(last_access)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_expiry ON entries(expires_at)"
+            )
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS meta (
+                    name  TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            """)
+            # Seeded once; from then on the triggers keep it current
+            self.conn.execute("""
+                INSERT OR IGNORE INTO meta
+                SELECT 'total_bytes', COALESCE(SUM(size), 0) FROM entries
+            """)
+            for event, change in [("INSERT", "+ new.size"),
+                                  ("DELETE", "- old.size"),
+                                  ("UPDATE OF size", "- old.size + new.size")]:
+                self.conn.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS entries_{event.split()[0].lower()}_size
+                    AFTER {event} ON entries BEGIN
+                        UPDATE meta SET value = value {change}
+                        WHERE name = 'total_bytes';
+                    END
+                """)
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def _total_bytes(self) -> int:
+        return self.conn.execute(
+            "SELECT value FROM meta WHERE name = 'total_bytes'"
+        ).fetchone()[0]
+
+    def get(self, key: str):
+        """Return the cached value, or None if missing or expired."""
+        now = time.time()
+        row = self.conn.execute(
+            "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = row
+        if expires_at is not None and expires_at <= now:
+            self.conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self.misses += 1
+            return None
+
+        self.conn.execute(
+            "UPDATE entries SET last_access = ? WHERE key = ?", (now, key)
+        )
+        self.hits += 1
+        return json.loads(value)
+
+    def set(self, key: str, data, ttl: float | None = None):
+        """Store a JSON-serializable value, then evict old entries if over the cap."""
+        ttl = self.default_ttl if ttl is None else ttl
+        value = json.dumps(data, separators=(",", ":"))
+        size = len(value.encode())
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # An upsert, not INSERT OR REPLACE: REPLACE skips delete triggers
+            self.conn.execute(
+                """INSERT INTO entries VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT (key) DO UPDATE SET
+                       value = excluded.value,
+                       size = excluded.size,
+                       expires_at = excluded.expires_at,
+                       last_access = excluded.last_access""",
+                (key, value, size, expires_at, now)
+            )
+            self._evict(now)
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def _evict(self, now: float):
+        """
+        Keep the cache under max_bytes.
+
+        Expired entries are swept every sweep_interval seconds (or at once
+        when over the cap); then least recently used ones go until it fits.
+        """
+        total = self._total_bytes()
+        if total > self.max_bytes or now - self._last_sweep >= self.sweep_interval:
+            self._last_sweep = now
+            self.evictions += self.conn.execute(
+                "DELETE FROM entries WHERE expires_at <= ?", (now,)
+            ).rowcount
+            total = self._total_bytes()
+        if total <= self.max_bytes:
+            return
+
+        doomed = []
+        for key, size in self.conn.execute(
+            "SELECT key, size FROM entries ORDER BY last_access"
+        ):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+
+        self.conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+        self.evictions += len(doomed)
+
+    def stats(self) -> dict:
+        """Hit/miss/eviction counters (this process) plus current size on disk."""
+        count = self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        total = self._total_bytes()
+        lookups = self.hits + self.misses
+        return {
+            "entries": count,
+            "bytes": total,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        self.conn.close()
+
+
 class CachedNominatimClient:
-    """Nominatim client with file-based caching."""
+    """Nominatim client with a persistent SQLite cache."""
 
     BASE_URL = "https://nominatim.openstreetmap.org"
 
-    def __init__(self, user_agent: str, cache_dir: str = ".cache"):
+    def __init__(self, user_agent: str, cache_dir: str = ".cache",
+                 ttl: float = 7 * 24 * 3600, max_bytes: int = 50_000_000):
         self.headers = {"User-Agent": user_agent}
-        self.cache_dir = Path(cache_dir)
-        self.cache_dir.mkdir(exist_ok=True)
-        self.rate_limiter = RateLimiter(calls_per_second=1)
+        self.cache = SQLiteCache(Path(cache_dir) / "nominatim.sqlite",
+                                 max_bytes=max_bytes, default_ttl=ttl)
+        # Shared with every other client talking to the same host
+        self.rate_limiter = get_rate_limiter(self.BASE_URL)
 
     def _cache_key(self, endpoint: str, params: dict) -> str:
         """Generate a unique cache key for a request."""
@@ -467,19 +749,18 @@ class CachedNominatimClient:
 
     def _get_cached(self, cache_key: str) -> dict | None:
         """Try to get cached response."""
-        cache_file = self.cache_dir / f"{cache_key}.json"
+        data = self.cache.get(cache_key)
 
-        if cache_file.exists():
+        if data is not None:
             print(f"  Cache HIT: {cache_key[:8]}...")
-            return json.loads(cache_file.read_text())
+            return data
 
         print(f"  Cache MISS: {cache_key[:8]}...")
         return None
 
     def _save_cache(self, cache_key: str, data):
         """Save response to cache."""
-        cache_file = self.cache_dir / f"{cache_key}.json"
-        cache_file.write_text(json.dumps(data, indent=2))
+        self.cache.set(cache_key, data)
 
     def search(self, query: str, limit: int = 5) -> list[dict]:
         """Search with caching."""
@@ -493,7 +774,7 @@ class CachedNominatimClient:
 
         # Make API call
         self.rate_limiter.wait()
-        response = requests.get(
+        response = http_get(
             f"{self.BASE_URL}/search",
             params=params,
             headers=self.headers,
@@ -528,6 +809,114 @@ def example_caching():
     if results2:
         print(f"  Found: {results2[0]['display_name'][:50]}...")
 
+    print(f"\nCache stats: {client.cache.stats()}")
+
+
+# =============================================================================
+# Example 11: Async Client with Connection Pooling
+# =============================================================================
+
+class AsyncNominatimClient:
+    """
+    asyncio Nominatim client: many requests in flight, one pooled session.
+
+    - A single requests.Session keeps connections open (keep-alive), so we
+      don't pay a new TCP/TLS handshake per call
+    - A semaphore caps how many requests run at once
+    - The per-host RateLimiter is shared with the sync clients, so the
+      public server still sees at most 1 request/second. Point base_url
+      at a self-hosted Nominatim (and raise its HOST_RATE_LIMITS entry)
+      to actually run requests in parallel.
+
+    requests is blocking, so each call runs in a worker thread; the
+    event loop just coordinates them.
+
+    Usage:
+        async with AsyncNominatimClient(USER_AGENT) as client:
+            results = await client.batch(["Taipei 101", "Tokyo Tower"])
+    """
+
+    BASE_URL = "https://nominatim.openstreetmap.org"
+
+    def __init__(self, user_agent: str, base_url: str | None = None,
+                 max_concurrency: int = 8):
+        self.base_url = (base_url or self.BASE_URL).rstrip("/")
+        self.rate_limiter = get_rate_limiter(self.base_url)
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+        # Its own pool, sized to the concurrency limit
+        self.session = create_session(pool_size=max_concurrency, user_agent=user_agent)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.session.close()
+        self._executor.shutdown(wait=False)
+
+    async def _get(self, endpoint: str, params: dict):
+        """GET base_url/endpoint and return parsed JSON, or None on failure."""
+        async with self._semaphore:
+            await self.rate_limiter.acquire()
+            loop = asyncio.get_running_loop()
+            try:
+                response = await loop.run_in_executor(
+                    self._executor,
+                    lambda: self.session.get(f"{self.base_url}/{endpoint}",
+                                             params=params, timeout=10)
+                )
+            except requests.exceptions.RequestException:
+                return None
+
+        if response.status_code == 200:
+            return response.json()
+        return None
+
+    async def search(self, query: str, limit: int = 5) -> list[dict]:
+        """Search for places by name."""
+        data = await self._get("search", {"q": query, "format": "json", "limit": limit})
+        return data or []
+
+    async def reverse(self, lat: float, lon: float) -> dict | None:
+        """Reverse geocode coordinates to address."""
+        return await self._get("reverse", {"lat": lat, "lon": lon, "format": "json"})
+
+    async def batch(self, queries: list[str], limit: int = 1) -> list[list[dict]]:
+        """Search for many queries concurrently; results keep the input order."""
+        return await asyncio.gather(*(self.search(q, limit=limit) for q in queries))
+
+
+def example_async_client():
+    """Demonstrate the AsyncNominatimClient."""
+    print("\n" + "="*60)
+    print("Example 11: Async Client with Connection Pooling")
+    print("="*60)
+
+    queries = ["Taipei 101", "Taipei Main Station", "Taipei Zoo"]
+
+    async def run():
+        async with AsyncNominatimClient(USER_AGENT) as client:
+            return await client.batch(queries)
+
+    start = time.monotonic()
+    results = asyncio.run(run())
+    elapsed = time.monotonic() - start
+
+    for query, found in zip(queries, results):
+        if found:
+            print(f"  {query}: ({found[0]['lat']}, {found[0]['lon']})")
+        else:
+            print(f"  {query}: not found")
+
+    # The public server allows 1 request/s, so this still takes ~2s;
+    # a self-hosted server with a higher limit would finish almost at once
+    print(f"\n{len(queries)} queries in {elapsed:.1f}s")
+
 
 # =============================================================================
 # Main - Run All Examples
@@ -551,6 +940,7 @@ def main():
         ("8", "Rate Limiter", example_rate_limiter),
         ("9", "Nominatim Client", example_nominatim_client),
         ("10", "Caching", example_caching),
+        ("11", "Async Client", example_async_client),
     ]
 
     print("\nAvailable examples:")
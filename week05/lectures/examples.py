@@ -12,11 +12,15 @@ Note: Examples make real API calls and require internet connection.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import json
 import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
-from typing import TypedDict, Optional
+from typing import TypedDict, Optional, Iterator
 
 
 # =============================================================================
@@ -27,6 +31,50 @@ USER_AGENT = "CS101-Examples/1.0 (cs101@university.edu)"
 BASE_URL = "https://nominatim.openstreetmap.org"
 
 
+# =============================================================================
+# Shared HTTP Session
+# =============================================================================
+
+# One requests.Session for every API helper. Connections stay open between
+# calls (keep-alive), so only the first request to a host pays for the
+# TCP/TLS handshake.
+DEFAULT_TIMEOUT = 10  # seconds
+_session = None
+
+
+def create_session(pool_size: int = 10, user_agent: str = USER_AGENT):
+    """Create a Session with a bounded connection pool and default headers."""
+    session = requests.Session()
+    session.headers.update({
+        "User-Agent": user_agent,
+        "Accept-Encoding": "gzip, deflate",
+    })
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session():
+    """Return the shared session, creating it on first use."""
+    global _session
+    if _session is None:
+        _session = create_session()
+    return _session
+
+
+def set_session(session) -> None:
+    """Replace the shared session (e.g. with a fake one in tests)."""
+    global _session
+    _session = session
+
+
+def http_get(url: str, params: dict | None = None, headers: dict | None = None,
+             timeout: float = DEFAULT_TIMEOUT):
+    """GET through the shared session, with a default timeout."""
+    return get_session().get(url, params=params, headers=headers, timeout=timeout)
+
+
 # =============================================================================
 # Example 1: Basic Nominatim Search
 # =============================================================================
@@ -49,7 +97,7 @@ def example_basic_search():
 
     print(f"Searching for: {params['q']}")
 
-    response = requests.get(url, params=params, headers=headers, timeout=10)
+    response = http_get(url, params=params, headers=headers, timeout=10)
 
     if response.status_code == 200:
         results = response.json()
@@ -91,7 +139,7 @@ def example_address_details():
 
     print(f"Searching for: {params['q']} (with address details)")
 
-    response = requests.get(url, params=params, headers=headers, timeout=10)
+    response = http_get(url, params=params, headers=headers, timeout=10)
 
     if response.status_code == 200:
         results = response.json()
@@ -215,7 +263,7 @@ def example_parse_results():
     params = {"q": "Shibuya Station Tokyo", "format": "json", "limit": 3}
     headers = {"User-Agent": USER_AGENT}
 
-    response = requests.get(url, params=params, headers=headers, timeout=10)
+    response = http_get(url, params=params, headers=headers, timeout=10)
 
     if response.status_code == 200:
         raw_results = response.json()
@@ -265,7 +313,7 @@ def example_bounding_box():
     params = {"q": "Central Park New York", "format": "json", "limit": 1}
     headers = {"User-Agent": USER_AGENT}
 
-    response = requests.get(url, params=params, headers=headers, timeout=10)
+    response = http_get(url, params=params, headers=headers, timeout=10)
 
     if response.status_code == 200:
         results = response.json()
@@ -292,24 +340,32 @@ def example_bounding_box():
 # Example 6: Error Handling
 # =============================================================================
 
+class GeocodingError(Exception):
+    """Base exception."""
+    pass
+
+
+class NetworkError(GeocodingError):
+    """Network errors."""
+    pass
+
+
+class RateLimitedError(NetworkError):
+    """Server said we are sending too many requests (HTTP 429)."""
+    pass
+
+
+class NotFoundError(GeocodingError):
+    """Place not found."""
+    pass
+
+
 def example_error_handling():
     """Demonstrate comprehensive error handling."""
     print("\n" + "="*60)
     print("Example 6: Error Handling")
     print("="*60)
 
-    class GeocodingError(Exception):
-        """Base exception."""
-        pass
-
-    class NetworkError(GeocodingError):
-        """Network errors."""
-        pass
-
-    class NotFoundError(GeocodingError):
-        """Place not found."""
-        pass
-
     def safe_geocode(query: str) -> dict:
         """Geocode with comprehensive error handling."""
         url = f"{BASE_URL}/search"
@@ -317,10 +373,10 @@ def example_error_handling():
         params = {"q": query, "format": "json", "limit": 1}
 
         try:
-            response = requests.get(url, params=params, headers=headers, timeout=10)
+            response = http_get(url, params=params, headers=headers, timeout=10)
 
             if response.status_code == 429:
-                raise NetworkError("Rate limit exceeded")
+                raise RateLimitedError("Rate limit exceeded")
 
             if response.status_code != 200:
                 raise NetworkError(f"HTTP {response.status_code}")
@@ -382,7 +438,7 @@ def example_reverse_geocoding():
         headers = {"User-Agent": USER_AGENT}
 
         try:
-            response = requests.get(url, params=params, headers=headers, timeout=10)
+            response = http_get(url, params=params, headers=headers, timeout=10)
             if response.status_code == 200:
                 return response.json()
         except requests.RequestException:
@@ -414,72 +470,244 @@ def example_reverse_geocoding():
 # Example 8: Complete Geocoder Class
 # =============================================================================
 
+def normalize_query(query: str) -> str:
+    """Case-fold and collapse whitespace so equivalent queries share a cache key."""
+    return " ".join(query.casefold().split())
+
+
+class LRUCache:
+    """
+    Small in-memory cache: keeps at most `maxsize` entries, drops the least
+    recently used one when full, and treats entries older than `ttl`
+    seconds as missing.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()  # key -> (expires_at, value)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if time.monotonic() < expires_at:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        """Store a value, evicting the least recently used entry if full."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class BatchItem(TypedDict):
+    """One row of a batch geocoding result."""
+    index: int
+    query: str
+    status: str            # "ok", "not_found", "network_error", "rate_limited" or "error"
+    result: Optional[dict]
+    error: Optional[str]
+
+
 class Geocoder:
     """Complete geocoding client."""
 
-    def __init__(self, user_agent: str):
+    def __init__(self, user_agent: str, cache_size: int = 512,
+                 cache_ttl: float = 3600, reverse_precision: int = 5,
+                 base_url: str = BASE_URL, min_interval: float = 1.0):
         self.headers = {"User-Agent": user_agent}
+        self.base_url = base_url
+        self.min_interval = min_interval  # lower this for a self-hosted server
         self.last_request = 0
+        self._rate_lock = threading.Lock()
+        # Repeated lookups are answered from memory, skipping the rate limit
+        self.cache = LRUCache(maxsize=cache_size, ttl=cache_ttl)
+        self.reverse_precision = reverse_precision  # 5 decimals ≈ 1 m
 
     def _rate_limit(self):
-        """Ensure 1 second between requests."""
-        elapsed = time.time() - self.last_request
-        if elapsed < 1:
-            time.sleep(1 - elapsed)
-        self.last_request = time.time()
+        """Ensure min_interval seconds between requests (safe across threads)."""
+        # Claim the next free time slot under the lock, then sleep outside it
+        with self._rate_lock:
+            now = time.monotonic()
+            slot = max(now, self.last_request + self.min_interval)
+            self.last_request = slot
+        if slot > now:
+            time.sleep(slot - now)
 
     def forward(self, query: str) -> dict | None:
         """Forward geocode."""
+        try:
+            return self.forward_or_raise(query)
+        except GeocodingError:
+            return None
+
+    def forward_or_raise(self, query: str) -> dict:
+        """
+        Forward geocode, raising a GeocodingError subclass on failure.
+
+        Raises:
+            NotFoundError: No results for the query
+            RateLimitedError: Server answered HTTP 429
+            NetworkError: Timeout, connection problem or other HTTP error
+            GeocodingError: Response could not be parsed
+        """
+        cache_key = ("forward", normalize_query(query))
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         self._rate_limit()
 
-        url = f"{BASE_URL}/search"
+        url = f"{self.base_url}/search"
         params = {"q": query, "format": "json", "limit": 1, "addressdetails": 1}
 
         try:
-            response = requests.get(url, params=params, headers=self.headers, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if data:
-                    r = data[0]
-                    return {
-                        "name": r.get("name", query),
-                        "lat": float(r["lat"]),
-                        "lon": float(r["lon"]),
-                        "display_name": r.get("display_name", ""),
-                        "address": r.get("address", {})
-                    }
-        except (requests.RequestException, ValueError, KeyError):
-            pass
-        return None
+            response = http_get(url, params=params, headers=self.headers, timeout=10)
+        except requests.RequestException as e:
+            raise NetworkError(str(e)) from e
+
+        if response.status_code == 429:
+            raise RateLimitedError("Rate limit exceeded")
+        if response.status_code != 200:
+            raise NetworkError(f"HTTP {response.status_code}")
+
+        try:
+            data = response.json()
+            if not data:
+                raise NotFoundError(f"No results for: {query}")
+            r = data[0]
+            result = {
+                "name": r.get("name", query),
+                "lat": float(r["lat"]),
+                "lon": float(r["lon"]),
+                "display_name": r.get("display_name", ""),
+                "address": r.get("address", {})
+            }
+        except (ValueError, KeyError) as e:
+            raise GeocodingError(f"Parse error: {e}") from e
+
+        self.cache.set(cache_key, result)
+        return result
 
     def reverse(self, lat: float, lon: float) -> dict | None:
         """Reverse geocode."""
+        cache_key = ("reverse",
+                     round(lat, self.reverse_precision),
+                     round(lon, self.reverse_precision))
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         self._rate_limit()
 
-        url = f"{BASE_URL}/reverse"
+        url = f"{self.base_url}/reverse"
         params = {"lat": lat, "lon": lon, "format": "json", "addressdetails": 1}
 
         try:
-            response = requests.get(url, params=params, headers=self.headers, timeout=10)
+            response = http_get(url, params=params, headers=self.headers, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 if "display_name" in data:
-                    return {
+                    result = {
                         "display_name": data["display_name"],
                         "address": data.get("address", {})
                     }
+                    self.cache.set(cache_key, result)
+                    return result
         except requests.RequestException:
             pass
         return None
 
     def batch(self, queries: list[str]) -> list[dict]:
-        """Geocode multiple places."""
-        results = []
-        for query in queries:
-            result = self.forward(query)
-            if result:
-                results.append(result)
-        return results
+        """Geocode multiple places (only the ones that were found)."""
+        return [item["result"] for item in self.batch_geocode(queries)
+                if item["status"] == "ok"]
+
+    def batch_geocode(self, queries: list[str], max_workers: int = 4) -> list[BatchItem]:
+        """
+        Geocode many queries; one BatchItem per query, in input order.
+
+        Failed lookups are reported with a status instead of being dropped,
+        so every output row matches its input row.
+        """
+        items: list[BatchItem] = [None] * len(queries)
+        for item in self.iter_batch_geocode(queries, max_workers=max_workers):
+            items[item["index"]] = item
+        return items
+
+    def iter_batch_geocode(self, queries: list[str],
+                           max_workers: int = 4) -> Iterator[BatchItem]:
+        """
+        Geocode many queries on a thread pool, yielding results as they finish.
+
+        Identical queries (after normalize_query) are looked up only once.
+        All lookups still go through the rate limiter, so against the public
+        server the threads mainly overlap network latency; with a
+        self-hosted server and a small min_interval they run in parallel.
+        """
+        # normalized query -> every input position asking for it
+        positions: dict[str, list[int]] = {}
+        for i, query in enumerate(queries):
+            positions.setdefault(normalize_query(query), []).append(i)
+
+        # Keep only a small window of lookups in flight, so a huge batch
+        # doesn't queue every future up front and closing the generator
+        # stops the remaining work
+        pending = iter(positions.values())
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+        futures = {}
+        try:
+            while True:
+                for indices in pending:
+                    futures[pool.submit(self.forward_or_raise,
+                                        queries[indices[0]])] = indices
+                    if len(futures) >= 2 * max_workers:
+                        break
+                if not futures:
+                    break
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    indices = futures.pop(future)
+                    status, result, error = "ok", None, None
+                    try:
+                        result = future.result()
+                    except NotFoundError as e:
+                        status, error = "not_found", str(e)
+                    except RateLimitedError as e:
+                        status, error = "rate_limited", str(e)
+                    except NetworkError as e:
+                        status, error = "network_error", str(e)
+                    except GeocodingError as e:
+                        status, error = "error", str(e)
+
+                    for i in indices:
+                        yield {"index": i, "query": queries[i], "status": status,
+                               "result": result, "error": error}
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
 
 
 def example_geocoder_class():
@@ -510,6 +738,23 @@ def example_geocoder_class():
     for r in results:
         print(f"  - {r['name']}: ({r['lat']:.4f}, {r['lon']:.4f})")
 
+    # Batch with per-item status (failures are reported, not dropped)
+    print("\nBatch with status:")
+    queries = ["Taipei 101", "xyzzy12345notaplace", "taipei 101"]
+    for item in geocoder.batch_geocode(queries):
+        if item["status"] == "ok":
+            print(f"  [{item['index']}] {item['query']}: ok")
+        else:
+            print(f"  [{item['index']}] {item['query']}: {item['status']} ({item['error']})")
+
+    # Repeated lookups come from the in-memory cache (no network, no wait)
+    print("\nRepeating 'tokyo   TOWER' (same query, different spelling):")
+    start = time.time()
+    result = geocoder.forward("tokyo   TOWER")
+    if result:
+        print(f"  {result['name']} in {(time.time() - start) * 1000:.1f} ms")
+    print(f"  Cache stats: {geocoder.cache.stats()}")
+
 
 # =============================================================================
 # Example 9: Address Formatting
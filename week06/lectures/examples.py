@@ -12,8 +12,11 @@ Note: Some examples make real API calls and require internet connection.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Generator, TypeVar, Callable, Iterable
 
 T = TypeVar('T')
@@ -26,6 +29,50 @@ USER_AGENT = "CS101-Examples/1.0 (cs101@university.edu)"
 BASE_URL = "https://nominatim.openstreetmap.org"
 
 
+# =============================================================================
+# Shared HTTP Session
+# =============================================================================
+
+# One requests.Session for every API helper. Connections stay open between
+# calls (keep-alive), so only the first request to a host pays for the
+# TCP/TLS handshake.
+DEFAULT_TIMEOUT = 10  # seconds
+_session = None
+
+
+def create_session(pool_size: int = 10, user_agent: str = USER_AGENT):
+    """Create a Session with a bounded connection pool and default headers."""
+    session = requests.Session()
+    session.headers.update({
+        "User-Agent": user_agent,
+        "Accept-Encoding": "gzip, deflate",
+    })
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session():
+    """Return the shared session, creating it on first use."""
+    global _session
+    if _session is None:
+        _session = create_session()
+    return _session
+
+
+def set_session(session) -> None:
+    """Replace the shared session (e.g. with a fake one in tests)."""
+    global _session
+    _session = session
+
+
+def http_get(url: str, params: dict | None = None, headers: dict | None = None,
+             timeout: float = DEFAULT_TIMEOUT):
+    """GET through the shared session, with a default timeout."""
+    return get_session().get(url, params=params, headers=headers, timeout=timeout)
+
+
 # =============================================================================
 # Example 1: Regular Function vs Generator
 # =============================================================================
@@ -288,7 +335,7 @@ def example_paginated_search():
                 params["exclude_place_ids"] = ",".join(map(str, exclude_ids))
 
             try:
-                response = requests.get(url, params=params, headers=headers, timeout=10)
+                response = http_get(url, params=params, headers=headers, timeout=10)
 
                 if response.status_code != 200:
                     return
@@ -352,7 +399,7 @@ def example_advanced_search():
             params["countrycodes"] = country
 
         try:
-            response = requests.get(url, params=params, headers=headers, timeout=10)
+            response = http_get(url, params=params, headers=headers, timeout=10)
 
             if response.status_code != 200:
                 return
@@ -458,7 +505,7 @@ def example_food_search():
         }
 
         try:
-            response = requests.get(url, params=params, headers=headers, timeout=10)
+            response = http_get(url, params=params, headers=headers, timeout=10)
 
             if response.status_code != 200:
                 return
@@ -483,6 +530,321 @@ def example_food_search():
             print(f"     City: {place['city']}")
 
 
+# =============================================================================
+# Example 13: Look-Ahead Search (Prefetching)
+# =============================================================================
+
+def place_batches(
+    query: str,
+    batch_size: int = 10,
+    max_batches: int = 5,
+    min_interval: float = 1.0,
+    cancel: threading.Event | None = None
+) -> Generator[list[dict], None, None]:
+    """
+    Yield raw Nominatim results one batch (one request) at a time.
+
+    Waits min_interval seconds between requests. If `cancel` is set while
+    waiting, stops without sending the next request. Paging is done by
+    PagedPlaceSearch (Example 14), which keeps the URL short.
+    """
+    search = PagedPlaceSearch(query, batch_size=batch_size, max_pages=max_batches,
+                              min_interval=min_interval, cancel=cancel)
+    yield from search.batches()
+
+
+_NO_MORE = object()
+
+
+def prefetch(
+    batches: Iterable[list[T]],
+    cancel: threading.Event | None = None
+) -> Generator[T, None, None]:
+    """
+    Yield the items of each batch, fetching the next batch in the background.
+
+    While the caller works through batch k, a worker thread is already
+    getting batch k+1, so the request (and its rate-limit wait) overlaps
+    with the caller's work. It stays lazy: at most one batch is fetched
+    ahead, and when the caller stops early (break / close()) the pending
+    fetch is cancelled and `cancel` is set so the source can stop waiting.
+    """
+    it = iter(batches)
+    executor = ThreadPoolExecutor(max_workers=1)
+    pending = executor.submit(next, it, _NO_MORE)
+
+    try:
+        while True:
+            batch = pending.result()
+            if batch is _NO_MORE:
+                pending = None
+                return
+            pending = executor.submit(next, it, _NO_MORE)  # look ahead one batch
+            yield from batch
+    finally:
+        if cancel is not None:
+            cancel.set()
+        close = getattr(it, "close", None)
+        if pending is not None and not pending.cancel():
+            # The fetch already started; close the source once it returns
+            if close is not None:
+                pending.add_done_callback(lambda _: close())
+        elif close is not None:
+            close()
+        executor.shutdown(wait=False)
+
+
+def search_places_lookahead(
+    query: str,
+    batch_size: int = 10,
+    max_batches: int = 5
+) -> Generator[dict, None, None]:
+    """Lazy place search that fetches the next batch while you read this one."""
+    cancel = threading.Event()
+    for place in prefetch(place_batches(query, batch_size, max_batches, cancel=cancel),
+                          cancel=cancel):
+        yield {
+            "name": place.get("display_name", "Unknown")[:50],
+            "type": place.get("type", "unknown")
+        }
+
+
+def example_lookahead_search():
+    """Demonstrate prefetching the next batch in the background."""
+    print("\n" + "="*60)
+    print("Example 13: Look-Ahead Search (Prefetching)")
+    print("="*60)
+
+    print("\nSearching for 'cafe taipei' (next batch loads in the background):")
+    start = time.monotonic()
+    search = search_places_lookahead("cafe taipei", batch_size=5, max_batches=3)
+
+    for i, place in enumerate(search, 1):
+        time.sleep(0.2)  # pretend the user is reading each result
+        print(f"  {i:2}. [{time.monotonic() - start:4.1f}s] {place['name']}...")
+        if i >= 12:
+            search.close()  # stop: the pending fetch is cancelled
+            print("  [Stopped early - no further batches requested]")
+            break
+
+
+# =============================================================================
+# Example 14: Deep Pagination Without Huge URLs
+# =============================================================================
+
+MAX_EXCLUDE_CHARS = 2000  # keeps URLs well under typical 4-8 KB server limits
+MIN_BOX_DEGREES = 0.0005  # don't split search areas smaller than ~50 m
+
+
+class PagedPlaceSearch:
+    """
+    Pagination engine for Nominatim searches.
+
+    Plain exclude_place_ids paging sends every id seen so far on every
+    request, so after a few hundred results the URL is too long (HTTP 414).
+    This engine:
+
+    - keeps seen ids in a set and removes duplicates on the client side
+    - keeps each exclusion string pre-joined and extends it with each
+      page's ids, instead of converting the whole id list for every page
+      (the string is still copied and sent in full, but it never grows
+      past max_exclude_chars)
+    - when the exclusion string would pass max_exclude_chars, splits the
+      search area (viewbox) into four smaller boxes and continues in each,
+      excluding only the ids already found inside that box
+    - counts pages and bytes spent, to show the cost per result
+
+    Limitation: without a viewbox, the first split uses the bounding box of
+    the results seen so far. From then on every request is bounded to that
+    box, so matches outside it are never found. Pass a viewbox covering
+    the whole area of interest for a complete search. Areas too small to
+    split further are given up on. stats() reports both cases (and any
+    areas left when max_pages ran out), so callers can tell whether the
+    results are complete.
+    """
+
+    def __init__(
+        self,
+        query: str,
+        batch_size: int = 40,
+        viewbox: tuple[float, float, float, float] | None = None,
+        max_pages: int = 50,
+        min_interval: float = 1.0,
+        max_exclude_chars: int = MAX_EXCLUDE_CHARS,
+        cancel: threading.Event | None = None
+    ):
+        self.query = query
+        self.batch_size = min(batch_size, 40)  # Nominatim max is 40
+        self.max_pages = max_pages
+        self.min_interval = min_interval
+        self.max_exclude_chars = max_exclude_chars
+        self.cancel = cancel
+
+        self.seen: set = set()
+        self.coords: dict = {}  # place_id -> (lon, lat), used when splitting
+        # Work stack of search areas: [viewbox or None, exclude string]
+        # viewbox = (min_lon, min_lat, max_lon, max_lat)
+        self.regions = [[viewbox, ""]]
+
+        self.pages = 0
+        self.bytes = 0
+        self.results = 0
+        self.splits = 0
+        self.abandoned = 0  # areas given up on; matches may remain there
+        self.narrowed_to_results = False  # no viewbox: bounded to results' box
+        self._last_request = float("-inf")
+
+    def _wait_turn(self) -> bool:
+        """Respect min_interval; return False if cancelled while waiting."""
+        delay = self._last_request + self.min_interval - time.monotonic()
+        if self.cancel is not None:
+            return not self.cancel.wait(max(delay, 0))
+        if delay > 0:
+            time.sleep(delay)
+        return True
+
+    def _split(self, box) -> list:
+        """Four quadrant regions of box, each excluding the ids found inside it."""
+        if box is None:
+            if not self.coords:
+                self.abandoned += 1
+                return []
+            lons = [lon for lon, _ in self.coords.values()]
+            lats = [lat for _, lat in self.coords.values()]
+            box = (min(lons), min(lats), max(lons), max(lats))
+            self.narrowed_to_results = True
+
+        min_lon, min_lat, max_lon, max_lat = box
+        if max_lon - min_lon < MIN_BOX_DEGREES and max_lat - min_lat < MIN_BOX_DEGREES:
+            self.abandoned += 1
+            return []  # too small to split further: give up on this area
+
+        mid_lon, mid_lat = (min_lon + max_lon) / 2, (min_lat + max_lat) / 2
+        quadrants = [
+            (min_lon, min_lat, mid_lon, mid_lat), (mid_lon, min_lat, max_lon, mid_lat),
+            (min_lon, mid_lat, mid_lon, max_lat), (mid_lon, mid_lat, max_lon, max_lat),
+        ]
+        regions = []
+        for q in quadrants:
+            inside = [pid for pid, (lon, lat) in self.coords.items()
+                      if q[0] <= lon <= q[2] and q[1] <= lat <= q[3]]
+            regions.append([q, ",".join(map(str, inside))])
+        self.splits += 1
+        return regions
+
+    def batches(self) -> Generator[list[dict], None, None]:
+        """Yield each page's new (not seen before) results."""
+        url = f"{BASE_URL}/search"
+        headers = {"User-Agent": USER_AGENT}
+
+        while self.regions and self.pages < self.max_pages:
+            region = self.regions[-1]
+            box, exclude = region
+
+            if len(exclude) > self.max_exclude_chars:
+                self.regions.pop()
+                self.regions.extend(self._split(box))
+                continue
+
+            if not self._wait_turn():
+                return
+
+            params = {"q": self.query, "format": "json", "limit": self.batch_size}
+            if exclude:
+                params["exclude_place_ids"] = exclude
+            if box is not None:
+                params["viewbox"] = ",".join(map(str, box))
+                params["bounded"] = 1
+
+            self._last_request = time.monotonic()
+            try:
+                response = http_get(url, params=params, headers=headers, timeout=10)
+            except requests.RequestException:
+                return
+            self.pages += 1
+            self.bytes += len(response.content)
+            if response.status_code != 200:
+                return
+
+            page = response.json()
+            if not page:
+                self.regions.pop()  # this area is exhausted
+                continue
+
+            ids = [place["place_id"] for place in page]
+            # Extend the string with this page's ids. It is copied, so each
+            # page costs O(len(exclude)), which max_exclude_chars bounds
+            added = ",".join(map(str, ids))
+            region[1] = f"{exclude},{added}" if exclude else added
+
+            new = []
+            for place in page:
+                pid = place["place_id"]
+                if pid in self.seen:
+                    continue
+                self.seen.add(pid)
+                if "lat" in place and "lon" in place:
+                    self.coords[pid] = (float(place["lon"]), float(place["lat"]))
+                new.append(place)
+
+            self.results += len(new)
+            if new:
+                yield new
+
+    def __iter__(self):
+        for batch in self.batches():
+            yield from batch
+
+    def stats(self) -> dict:
+        """
+        Pages, bytes and splits spent, the cost per result, and whether
+        the search is complete.
+
+        complete is False if any area was abandoned, the search was
+        narrowed to the results' bounding box, or areas were still
+        waiting when it stopped (max_pages, an error, or cancel).
+        """
+        complete = (not self.regions and not self.abandoned
+                    and not self.narrowed_to_results)
+        return {
+            "results": self.results,
+            "pages": self.pages,
+            "bytes": self.bytes,
+            "splits": self.splits,
+            "abandoned_regions": self.abandoned,
+            "pending_regions": len(self.regions),
+            "narrowed_to_results": self.narrowed_to_results,
+            "complete": complete,
+            "pages_per_result": self.pages / self.results if self.results else 0.0,
+            "bytes_per_result": self.bytes / self.results if self.results else 0.0,
+        }
+
+
+def example_deep_pagination():
+    """Demonstrate deep pagination with bounded URL length."""
+    print("\n" + "="*60)
+    print("Example 14: Deep Pagination Without Huge URLs")
+    print("="*60)
+
+    # Taipei city area: (min_lon, min_lat, max_lon, max_lat)
+    taipei = (121.45, 24.96, 121.67, 25.21)
+    search = PagedPlaceSearch("restaurant", viewbox=taipei, max_pages=4)
+
+    print("\nFetching 'restaurant' in Taipei, 40 per page:")
+    for i, place in enumerate(search, 1):
+        if i % 40 == 0:
+            print(f"  {i} results so far...")
+
+    stats = search.stats()
+    print(f"\nResults: {stats['results']}  Pages: {stats['pages']}  "
+          f"Area splits: {stats['splits']}")
+    print(f"Cost: {stats['pages_per_result']:.3f} pages and "
+          f"{stats['bytes_per_result']:.0f} bytes per result")
+    if not stats["complete"]:
+        print(f"Incomplete: {stats['pending_regions']} areas not finished, "
+              f"{stats['abandoned_regions']} given up")
+
+
 # =============================================================================
 # Main Menu
 # =============================================================================
@@ -506,6 +868,8 @@ def main():
         ("10", "Advanced Search", example_advanced_search),
         ("11", "Generator Utilities", example_generator_utilities),
         ("12", "Food Search Preview", example_food_search),
+        ("13", "Look-Ahead Search", example_lookahead_search),
+        ("14", "Deep Pagination", example_deep_pagination),
     ]
 
     print("\nAvailable examples:")
@@ -523,7 +887,7 @@ def main():
         elif choice == 'a':
             for num, name, func in examples:
                 func()
-                if num in ['9', '10', '12']:  # API examples need rate limiting
+                if num in ['9', '10', '12', '13', '14']:  # API examples need rate limiting
                     time.sleep(1)
             break
         else:
@@ -8,16 +8,131 @@ Note: Some examples require internet access to reach the OSRM API.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+import threading
 import time
 import math
 import json
+import sqlite3
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+# =============================================================================
+# Shared HTTP Session
+# =============================================================================
+
+# One requests.Session for every API helper. Connections stay open between
+# calls (keep-alive), so only the first request to a host pays for the
+# TCP/TLS handshake.
+DEFAULT_TIMEOUT = 10  # seconds
+_session = None
+
+
+def create_session(pool_size: int = 10, user_agent: str = "CS101-Examples/1.0 (cs101@university.edu)"):
+    """Create a Session with a bounded connection pool and default headers."""
+    session = requests.Session()
+    session.headers.update({
+        "User-Agent": user_agent,
+        "Accept-Encoding": "gzip, deflate",
+    })
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session():
+    """Return the shared session, creating it on first use."""
+    global _session
+    if _session is None:
+        _session = create_session()
+    return _session
+
+
+def set_session(session) -> None:
+    """Replace the shared session (e.g. with a fake one in tests)."""
+    global _session
+    _session = session
+
+
+def http_get(url: str, params: dict | None = None, headers: dict | None = None,
+             timeout: float = DEFAULT_TIMEOUT):
+    """GET through the shared session, with a default timeout."""
+    return get_session().get(url, params=params, headers=headers, timeout=timeout)
+
 
 # =============================================================================
 # Example 1: Haversine Distance Calculation
 # =============================================================================
 
+EARTH_RADIUS_KM = 6371.0  # Earth's radius in kilometers
+NUMPY_BATCH_MIN = 64  # Smaller batches are faster in plain Python
+
+
+def haversine_batch(origins: list[tuple[float, float]],
+                    destinations: list[tuple[float, float]]) -> list[float]:
+    """
+    Calculate straight-line distances for many point pairs in one call.
+
+    Pair k is origins[k] → destinations[k]. With NumPy installed, large
+    batches are computed as whole arrays; otherwise (or for small batches)
+    a plain-Python loop produces the same numbers.
+
+    Args:
+        origins: List of (lat, lon) pairs in degrees
+        destinations: List of (lat, lon) pairs in degrees, same length
+
+    Returns:
+        List of distances in kilometers
+    """
+    if len(origins) != len(destinations):
+        raise ValueError("origins and destinations must have the same length")
+
+    if NUMPY_AVAILABLE and len(origins) >= NUMPY_BATCH_MIN:
+        p1 = np.asarray(origins, dtype=float)
+        p2 = np.asarray(destinations, dtype=float)
+        return _haversine_numpy(p1, p2).tolist()
+
+    distances = []
+    for (lat1, lon1), (lat2, lon2) in zip(origins, destinations):
+        # Convert degrees to radians
+        lat1_rad = math.radians(lat1)
+        lat2_rad = math.radians(lat2)
+        delta_lat = math.radians(lat2 - lat1)
+        delta_lon = math.radians(lon2 - lon1)
+
+        # Haversine formula
+        a = (math.sin(delta_lat / 2) ** 2 +
+             math.cos(lat1_rad) * math.cos(lat2_rad) *
+             math.sin(delta_lon / 2) ** 2)
+        c = 2 * math.asin(math.sqrt(a))
+        distances.append(EARTH_RADIUS_KM * c)
+
+    return distances
+
+
+def _haversine_numpy(p1, p2):
+    """NumPy version of the batch formula; p1, p2 are (m, 2) lat/lon arrays."""
+    lat1_rad = np.radians(p1[:, 0])
+    lat2_rad = np.radians(p2[:, 0])
+    delta_lat = np.radians(p2[:, 0] - p1[:, 0])
+    delta_lon = np.radians(p2[:, 1] - p1[:, 1])
+
+    a = (np.sin(delta_lat / 2) ** 2 +
+         np.cos(lat1_rad) * np.cos(lat2_rad) *
+         np.sin(delta_lon / 2) ** 2)
+    c = 2 * np.arcsin(np.sqrt(a))
+    return EARTH_RADIUS_KM * c
+
+
 def haversine_distance(lat1: float, lon1: float,
                        lat2: float, lon2: float) -> float:
     """
@@ -30,21 +145,7 @@ def haversine_distance(lat1: float, lon1: float,
     Returns:
         Distance in kilometers
     """
-    R = 6371.0  # Earth's radius in kilometers
-
-    # Convert degrees to radians
-    lat1_rad = math.radians(lat1)
-    lat2_rad = math.radians(lat2)
-    delta_lat = math.radians(lat2 - lat1)
-    delta_lon = math.radians(lon2 - lon1)
-
-    # Haversine formula
-    a = (math.sin(delta_lat / 2) ** 2 +
-         math.cos(lat1_rad) * math.cos(lat2_rad) *
-         math.sin(delta_lon / 2) ** 2)
-    c = 2 * math.asin(math.sqrt(a))
-
-    return R * c
+    return haversine_batch([(lat1, lon1)], [(lat2, lon2)])[0]
 
 
 def example_haversine():
@@ -72,27 +173,43 @@ def example_haversine():
 # =============================================================================
 
 def get_simple_route(start_lon: float, start_lat: float,
-                     end_lon: float, end_lat: float) -> Optional[dict]:
+                     end_lon: float, end_lat: float,
+                     cache: Optional["RouteCache"] = None) -> Optional[dict]:
     """
     Get a simple route between two points using OSRM.
 
     Args:
         start_lon, start_lat: Starting point (longitude, latitude)
         end_lon, end_lat: Ending point (longitude, latitude)
+        cache: Optional RouteCache to read from / save to
 
     Returns:
         Route information dict or None if failed
     """
+    start = {"lat": start_lat, "lon": start_lon}
+    end = {"lat": end_lat, "lon": end_lon}
+    if cache is not None:
+        cached = cache.get(start, end)
+        if cached is not None:
+            return {
+                "distance_m": cached["distance_m"],
+                "distance_km": cached["distance_m"] / 1000,
+                "duration_s": cached["duration_s"],
+                "duration_min": cached["duration_s"] / 60
+            }
+
     # IMPORTANT: OSRM uses longitude,latitude order!
     coordinates = f"{start_lon},{start_lat};{end_lon},{end_lat}"
     url = f"https://router.project-osrm.org/route/v1/driving/{coordinates}"
 
     try:
-        response = requests.get(url, timeout=10)
+        response = http_get(url, timeout=10)
         data = response.json()
 
         if data.get("code") == "Ok" and data.get("routes"):
             route = data["routes"][0]
+            if cache is not None:
+                cache.put(start, end, route["distance"], route["duration"])
             return {
                 "distance_m": route["distance"],
                 "distance_km": route["distance"] / 1000,
@@ -180,28 +297,168 @@ def example_2d_lists():
 # Example 4: Building a Haversine Distance Matrix
 # =============================================================================
 
-def build_haversine_matrix(locations: list[dict]) -> list[list[float]]:
+class SymmetricMatrix:
+    """
+    Compact n×n distance matrix for symmetric data (matrix[i][j] == matrix[j][i]).
+
+    The diagonal is always 0, so only the n*(n-1)/2 values above it are
+    stored, packed column by column in one flat array('d'):
+
+        index(i, j) = j*(j-1)/2 + i   for i < j
+
+    Reading works exactly like a 2D list: matrix[i][j], len(matrix) and
+    `for row in matrix` all behave the same way.
+    """
+
+    def __init__(self, n: int, values=None):
+        """Create an n×n matrix from packed values (all zeros if omitted)."""
+        size = n * (n - 1) // 2
+        if values is None:
+            self._data = array('d', bytes(8 * size))
+        else:
+            self._data = array('d', values)
+        if len(self._data) != size:
+            raise ValueError(f"Expected {size} packed values, got {len(self._data)}")
+        self.n = n
+
+    @classmethod
+    def from_points(cls, points: list[tuple[float, float]],
+                    scale: float = 1.0,
+                    ndigits: Optional[int] = None) -> 'SymmetricMatrix':
+        """
+        Build the Haversine matrix for (lat, lon) points in one batch pass.
+
+        Args:
+            points: List of (lat, lon) pairs
+            scale: Multiply every distance (km) by this factor
+            ndigits: Round each value to this many decimals (None = no rounding)
+
+        Returns:
+            SymmetricMatrix of scaled distances
+        """
+        n = len(points)
+        matrix = cls(n)
+        if n < 2:
+            return matrix
+
+        if NUMPY_AVAILABLE:
+            pts = np.asarray(points, dtype=float)
+            # Row-major lower triangle of (j, i) == our column-packed order
+            cols, rows = np.tril_indices(n, -1)
+            values = _haversine_numpy(pts[rows], pts[cols]) * scale
+            if ndigits is not None:
+                values = np.round(values, ndigits)
+            matrix._data = array('d', values.astype(float).tobytes())
+            return matrix
+
+        # One column at a time, so only O(n) temporary lists exist at once
+        data = array('d')
+        for j in range(1, n):
+            distances = haversine_batch(points[:j], [points[j]] * j)
+            if ndigits is None:
+                data.extend(d * scale for d in distances)
+            else:
+                data.extend(round(d * scale, ndigits) for d in distances)
+        matrix._data = data
+        return matrix
+
+    def _index(self, i: int, j: int) -> int:
+        if i > j:
+            i, j = j, i
+        return j * (j - 1) // 2 + i
+
+    def get(self, i: int, j: int) -> float:
+        """Return the value at row i, column j."""
+        if not (0 <= i < self.n and 0 <= j < self.n):
+            raise IndexError(f"({i}, {j}) out of range for {self.n}x{self.n} matrix")
+        if i == j:
+            return 0.0
+        return self._data[self._index(i, j)]
+
+    def set(self, i: int, j: int, value: float) -> None:
+        """Set both [i][j] and [j][i] to value."""
+        if i == j:
+            raise ValueError("Diagonal of a SymmetricMatrix is always 0")
+        if not (0 <= i < self.n and 0 <= j < self.n):
+            raise IndexError(f"({i}, {j}) out of range for {self.n}x{self.n} matrix")
+        self._data[self._index(i, j)] = value
+
+    def __getitem__(self, key):
+        """matrix[i] returns a row view; matrix[i, j] returns a value."""
+        if isinstance(key, tuple):
+            return self.get(*key)
+        if key < 0:
+            key += self.n
+        if not 0 <= key < self.n:
+            raise IndexError(f"Row {key} out of range")
+        return _SymmetricRow(self, key)
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __iter__(self):
+        for i in range(self.n):
+            yield _SymmetricRow(self, i)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the packed values."""
+        return len(self._data) * self._data.itemsize
+
+    def to_list(self) -> list[list[float]]:
+        """Expand into a regular 2D list (n×n)."""
+        return [list(row) for row in self]
+
+    def __repr__(self) -> str:
+        return f"SymmetricMatrix(n={self.n}, stored={len(self._data)})"
+
+
+class _SymmetricRow:
+    """Read-only view of one row of a SymmetricMatrix."""
+
+    def __init__(self, matrix: SymmetricMatrix, i: int):
+        self._matrix = matrix
+        self._i = i
+
+    def __getitem__(self, j: int) -> float:
+        # Same as matrix.get(i, j), inlined: this is the hot path for m[i][j]
+        i, n = self._i, self._matrix.n
+        if j < 0:
+            j += n
+        if not 0 <= j < n:
+            raise IndexError(f"({i}, {j}) out of range for {n}x{n} matrix")
+        if i == j:
+            return 0.0
+        if i > j:
+            i, j = j, i
+        return self._matrix._data[j * (j - 1) // 2 + i]
+
+    def __len__(self) -> int:
+        return self._matrix.n
+
+    def __iter__(self):
+        for j in range(self._matrix.n):
+            yield self._matrix.get(self._i, j)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+def build_haversine_matrix(locations: list[dict]) -> SymmetricMatrix:
     """
     Build a distance matrix using Haversine distances.
 
+    Each pair is computed once (distance A→B equals B→A), and the result
+    is stored as a SymmetricMatrix. Read it like a 2D list: matrix[i][j].
+
     Args:
         locations: List of dicts with 'name', 'lat', 'lon'
 
     Returns:
-        2D matrix of distances in km
+        Symmetric matrix of distances in km
     """
-    n = len(locations)
-    matrix = [[0.0 for _ in range(n)] for _ in range(n)]
-
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                matrix[i][j] = round(haversine_distance(
-                    locations[i]['lat'], locations[i]['lon'],
-                    locations[j]['lat'], locations[j]['lon']
-                ), 2)
-
-    return matrix
+    points = [(loc['lat'], loc['lon']) for loc in locations]
+    return SymmetricMatrix.from_points(points, ndigits=2)
 
 
 def print_matrix(matrix: list[list[float]], locations: list[dict],
@@ -219,7 +476,7 @@ def print_matrix(matrix: list[list[float]], locations: list[dict],
     for i, row in enumerate(matrix):
         print(f"{locations[i]['name'][:8]:>10}", end="")
         for val in row:
-            print(f"{val:>10.2f}", end="")
+            print(f"{val:>10.2f}" if val is not None else f"{'—':>10}", end="")
         print()
 
 
@@ -238,12 +495,19 @@ def example_haversine_matrix():
     matrix = build_haversine_matrix(locations)
     print_matrix(matrix, locations, "Haversine Distance Matrix (km)")
 
+    n = len(locations)
+    print(f"\nStored values: {n * (n - 1) // 2} (a full 2D list holds {n * n})")
+
 
 # =============================================================================
 # Example 5: OSRM Table Service
 # =============================================================================
 
-def get_osrm_table(locations: list[dict]) -> tuple[list[list[float]], list[list[float]]]:
+OSRM_BASE_URL = "https://router.project-osrm.org"
+OSRM_TILE_SIZE = 100  # points per side of one /table request (keeps URLs short)
+
+
+def get_osrm_table(locations: list[dict]) -> tuple[list[list], list[list]]:
     """
     Get distance/duration matrix using OSRM's table service.
 
@@ -251,44 +515,199 @@ def get_osrm_table(locations: list[dict]) -> tuple[list[list[float]], list[list[
         locations: List of dicts with 'lat' and 'lon'
 
     Returns:
-        Tuple of (distance_km matrix, duration_min matrix)
+        Tuple of (distance_km matrix, duration_min matrix).
+        Cells OSRM could not compute are None (never a fake 0).
     """
-    # Build coordinates string (lon,lat;lon,lat;...)
-    coords = ";".join(f"{loc['lon']},{loc['lat']}" for loc in locations)
-    url = f"https://router.project-osrm.org/table/v1/driving/{coords}"
+    return get_osrm_table_tiled(locations)
+
+
+def get_osrm_table_tiled(sources: list[dict],
+                         destinations: Optional[list[dict]] = None,
+                         tile_size: int = OSRM_TILE_SIZE,
+                         max_workers: int = 4,
+                         min_interval: float = 0.5,
+                         retries: int = 3,
+                         base_url: str = OSRM_BASE_URL,
+                         profile: str = "driving",
+                         raw: bool = False,
+                         stats: Optional[dict] = None) -> tuple[list[list], list[list]]:
+    """
+    Build a sources × destinations matrix from many small /table requests.
 
-    try:
-        response = requests.get(
-            url,
-            params={"annotations": "distance,duration"},
-            timeout=30
-        )
-        data = response.json()
+    One request with every coordinate breaks past ~100 points (URL length
+    and the server's max-table-size). Instead the matrix is cut into
+    tile_size × tile_size blocks; each block is one request that lists only
+    its own coordinates and picks rows/columns with the `sources` and
+    `destinations` parameters. Blocks are fetched on a thread pool, at most
+    one request per min_interval seconds, and a block hit by a network
+    error or server overload is retried with a growing back-off.
 
-        if data.get("code") == "Ok":
-            # Convert meters to km
-            distances = data.get("distances", [])
-            distance_km = [
-                [round(d / 1000, 2) if d else 0 for d in row]
-                for row in distances
-            ]
+    Args:
+        sources: Row locations (dicts with 'lat' and 'lon')
+        destinations: Column locations (default: same as sources)
+        tile_size: Maximum rows/columns per request
+        max_workers: Requests in flight at once
+        min_interval: Minimum seconds between request starts
+        retries: Extra attempts per block after a network error, HTTP 429
+            or 5xx (OSRM error codes are not retried)
+        base_url: OSRM server (a self-hosted one can use min_interval=0)
+        profile: OSRM profile (driving, foot, bike)
+        raw: Return OSRM's unrounded meters/seconds instead of km/minutes
+        stats: Optional dict, filled with tiles/requests/failed_tiles
 
-            # Convert seconds to minutes
-            durations = data.get("durations", [])
-            duration_min = [
-                [round(d / 60, 1) if d else 0 for d in row]
-                for row in durations
-            ]
+    Returns:
+        Tuple of (distance_km matrix, duration_min matrix), or
+        (distance_m, duration_s) when raw=True. A cell is None when OSRM
+        found no route or its block failed after all retries.
+    """
+    if destinations is None:
+        destinations = sources
+    n, m = len(sources), len(destinations)
+    distance_km = [[None] * m for _ in range(n)]
+    duration_min = [[None] * m for _ in range(n)]
+
+    def store(i: int, j: int, d: Optional[float], t: Optional[float]):
+        if d is not None:
+            distance_km[i][j] = d if raw else round(d / 1000, 2)
+        if t is not None:
+            duration_min[i][j] = t if raw else round(t / 60, 1)
+
+    blocks = [(range(r, min(r + tile_size, n)), range(c, min(c + tile_size, m)))
+              for r in range(0, n, tile_size) for c in range(0, m, tile_size)]
+    _fetch_table_blocks(sources, destinations, blocks, store, max_workers,
+                        min_interval, retries, base_url, profile, stats)
+    return distance_km, duration_min
+
+
+def get_osrm_pairs(sources: list[dict],
+                   destinations: list[dict],
+                   pairs: list[tuple[int, int]],
+                   tile_size: int = OSRM_TILE_SIZE,
+                   max_workers: int = 4,
+                   min_interval: float = 0.5,
+                   retries: int = 3,
+                   base_url: str = OSRM_BASE_URL,
+                   profile: str = "driving",
+                   stats: Optional[dict] = None) -> dict[tuple[int, int], tuple[float, float]]:
+    """
+    Distance/duration for selected (source, destination) cells only.
 
-            return distance_km, duration_min
+    A full matrix for N scattered pairs would cost N×N cells to fill N.
+    Instead the pairs are grouped by source and each source gets one
+    one-to-many request (split every tile_size destinations). Full tiles
+    are used instead only when they need fewer requests and at least a
+    quarter of the cells they compute are actually wanted. Rate limiting and retries are the same
+    as in get_osrm_table_tiled.
 
-    except requests.RequestException as e:
-        print(f"Request error: {e}")
+    Args:
+        sources: Origin locations (dicts with 'lat' and 'lon')
+        destinations: Target locations
+        pairs: (source index, destination index) cells to fetch
+        Other arguments: as in get_osrm_table_tiled
 
-    # Return empty matrices on failure
-    n = len(locations)
-    empty = [[0.0 for _ in range(n)] for _ in range(n)]
-    return empty, empty
+    Returns:
+        Dict (i, j) -> (distance_m, duration_s) with OSRM's raw values.
+        Pairs with no route, or whose request failed, are left out.
+    """
+    wanted = set(pairs)
+    by_source: dict[int, list[int]] = {}
+    for i, j in wanted:
+        by_source.setdefault(i, []).append(j)
+
+    one_to_many = [([i], cols[k:k + tile_size])
+                   for i, cols in sorted(by_source.items())
+                   for k in range(0, len(cols), tile_size)]
+
+    rows = sorted(by_source)
+    cols = sorted({j for _, j in wanted})
+    tiled = [(rows[r:r + tile_size], cols[c:c + tile_size])
+             for r in range(0, len(rows), tile_size)
+             for c in range(0, len(cols), tile_size)]
+
+    results: dict[tuple[int, int], tuple[float, float]] = {}
+
+    def store(i: int, j: int, d: Optional[float], t: Optional[float]):
+        if d is not None and t is not None and (i, j) in wanted:
+            results[(i, j)] = (d, t)
+
+    fill = len(wanted) / (len(rows) * len(cols)) if wanted else 0
+    blocks = tiled if len(tiled) < len(one_to_many) and fill >= 0.25 else one_to_many
+    _fetch_table_blocks(sources, destinations, blocks, store, max_workers,
+                        min_interval, retries, base_url, profile, stats)
+    return results
+
+
+def _fetch_table_blocks(sources, destinations, blocks, store, max_workers,
+                        min_interval, retries, base_url, profile, stats) -> int:
+    """
+    Fetch /table blocks on a thread pool; return how many blocks failed.
+
+    Each block is (row indices, column indices). Every cell OSRM returns
+    is passed to store(i, j, distance_m, duration_s); each block writes
+    only its own cells, so store needs no lock.
+    """
+    if stats is not None:
+        stats.update({"tiles": len(blocks), "requests": 0, "failed_tiles": 0})
+
+    # Shared "next allowed start time" for all worker threads
+    lock = threading.Lock()
+    next_start = [time.monotonic()]
+
+    def wait_turn():
+        with lock:
+            now = time.monotonic()
+            slot = max(now, next_start[0])
+            next_start[0] = slot + min_interval
+            if stats is not None:
+                stats["requests"] += 1
+        if slot > now:
+            time.sleep(slot - now)
+
+    def fetch_block(row_ids, col_ids) -> bool:
+        points = [sources[i] for i in row_ids] + [destinations[j] for j in col_ids]
+        coords = ";".join(f"{p['lon']},{p['lat']}" for p in points)
+        params = {
+            "sources": ";".join(str(i) for i in range(len(row_ids))),
+            "destinations": ";".join(str(len(row_ids) + j) for j in range(len(col_ids))),
+            "annotations": "distance,duration",
+        }
+
+        for attempt in range(retries + 1):
+            if attempt:
+                time.sleep(min(2 ** attempt, 30))  # back off: 2s, 4s, 8s...
+            wait_turn()
+            try:
+                response = http_get(f"{base_url}/table/v1/{profile}/{coords}",
+                                    params=params, timeout=30)
+            except requests.RequestException:
+                continue  # network trouble: worth another try
+            if response.status_code == 429 or response.status_code >= 500:
+                continue  # busy or failing server: worth another try
+
+            # Anything else is OSRM's final answer (TooBig, InvalidQuery,
+            # InvalidValue, ...): retrying the same request cannot help
+            try:
+                data = response.json()
+            except ValueError:
+                return False
+            if data.get("code") != "Ok":
+                return False
+
+            for i, dist_row, dur_row in zip(row_ids, data["distances"], data["durations"]):
+                for j, d, t in zip(col_ids, dist_row, dur_row):
+                    store(i, j, d, t)
+            return True
+        return False
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(lambda block: fetch_block(*block), blocks))
+
+    failed = results.count(False)
+    if failed:
+        print(f"OSRM table: {failed} of {len(blocks)} blocks failed; their cells are None")
+    if stats is not None:
+        stats["failed_tiles"] = failed
+    return failed
 
 
 def example_osrm_table():
@@ -342,10 +761,13 @@ def example_compare_distances():
                 h = haversine[i][j]
                 o = osrm_dist[i][j]
                 t = osrm_dur[i][j]
-                ratio = o / h if h > 0 else 0
 
                 print(f"\n{locations[i]['name']} → {locations[j]['name']}")
                 print(f"  Haversine:     {h:>7.2f} km")
+                if o is None or t is None:
+                    print("  OSRM Driving:  no route")
+                    continue
+                ratio = o / h if h > 0 else 0
                 print(f"  OSRM Driving:  {o:>7.2f} km ({t:.0f} min)")
                 print(f"  Ratio:         {ratio:>7.2f}x")
 
@@ -354,24 +776,153 @@ def example_compare_distances():
 # Example 7: Route with Geometry
 # =============================================================================
 
-def get_route_with_geometry(start: dict, end: dict) -> Optional[dict]:
+def encode_polyline(coordinates, precision: int = 6) -> str:
+    """Encode [lon, lat] pairs as a Google/OSRM polyline string."""
+    factor = 10 ** precision
+    chunks = []
+    prev_lat = prev_lon = 0
+    for lon, lat in coordinates:
+        lat_i, lon_i = round(lat * factor), round(lon * factor)
+        for delta in (lat_i - prev_lat, lon_i - prev_lon):
+            value = ~(delta << 1) if delta < 0 else delta << 1
+            while value >= 0x20:
+                chunks.append(chr((0x20 | (value & 0x1f)) + 63))
+                value >>= 5
+            chunks.append(chr(value + 63))
+        prev_lat, prev_lon = lat_i, lon_i
+    return "".join(chunks)
+
+
+def decode_polyline(encoded: str, precision: int = 6) -> array:
+    """Decode a polyline string into a flat array('d'): lat0, lon0, lat1, lon1, ..."""
+    factor = 10 ** precision
+    values = array("d")
+    index = lat = lon = 0
+    length = len(encoded)
+    while index < length:
+        for axis in (0, 1):
+            shift = result = 0
+            while True:
+                byte = ord(encoded[index]) - 63
+                index += 1
+                result |= (byte & 0x1f) << shift
+                shift += 5
+                if byte < 0x20:
+                    break
+            delta = ~(result >> 1) if result & 1 else result >> 1
+            if axis == 0:
+                lat += delta
+            else:
+                lon += delta
+        values.append(lat / factor)
+        values.append(lon / factor)
+    return values
+
+
+class RouteGeometry:
+    """
+    A route line kept as OSRM's encoded polyline6 string.
+
+    The string takes about 6 bytes per point, while a list of [lon, lat]
+    lists takes well over 100. Points are decoded only when something
+    actually reads them, and then kept in a packed array('d').
+
+    Indexing and iteration give [lon, lat] pairs (GeoJSON order), so it can
+    be used wherever a coordinates list was expected. latlon() gives the
+    [lat, lon] order that folium wants.
+    """
+
+    def __init__(self, encoded: str, precision: int = 6):
+        self.encoded = encoded
+        self.precision = precision
+        self._packed: Optional[array] = None
+
+    @classmethod
+    def from_coordinates(cls, coordinates, precision: int = 6) -> "RouteGeometry":
+        """Build from [lon, lat] pairs."""
+        return cls(encode_polyline(coordinates, precision), precision)
+
+    def packed(self) -> array:
+        """Flat array of lat, lon values (decoded on first use)."""
+        if self._packed is None:
+            self._packed = decode_polyline(self.encoded, self.precision)
+        return self._packed
+
+    def lonlat(self) -> list[list[float]]:
+        """[lon, lat] pairs, for GeoJSON."""
+        v = self.packed()
+        return [[v[k + 1], v[k]] for k in range(0, len(v), 2)]
+
+    def latlon(self) -> list[list[float]]:
+        """[lat, lon] pairs, for folium.PolyLine."""
+        v = self.packed()
+        return [[v[k], v[k + 1]] for k in range(0, len(v), 2)]
+
+    def __len__(self) -> int:
+        if self._packed is not None:
+            return len(self._packed) // 2
+        # Every encoded number ends with a character below chr(0x20 + 63)
+        ends = sum(1 for ch in self.encoded if ord(ch) < 0x5f)
+        return ends // 2
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self[k] for k in range(*key.indices(len(self)))]
+        n = len(self)
+        if key < 0:
+            key += n
+        if not 0 <= key < n:
+            raise IndexError("point index out of range")
+        v = self.packed()
+        return [v[2 * key + 1], v[2 * key]]
+
+    def __iter__(self):
+        v = self.packed()
+        for k in range(0, len(v), 2):
+            yield [v[k + 1], v[k]]
+
+    def __repr__(self) -> str:
+        return f"RouteGeometry({len(self)} points, {len(self.encoded)} chars)"
+
+
+def _route_result(distance_m: float, duration_s: float,
+                  geometry: RouteGeometry) -> dict:
+    """Build the route dict returned by get_route_with_geometry."""
+    return {
+        "distance_km": round(distance_m / 1000, 2),
+        "duration_min": round(duration_s / 60, 1),
+        "polyline": geometry.encoded,
+        "coordinates": geometry,  # decoded lazily, [lon, lat] on access
+        "num_points": len(geometry)
+    }
+
+
+def get_route_with_geometry(start: dict, end: dict,
+                            cache: Optional["RouteCache"] = None) -> Optional[dict]:
     """
     Get a route with full geometry from OSRM.
 
     Args:
         start: Dict with 'lat', 'lon'
         end: Dict with 'lat', 'lon'
+        cache: Optional RouteCache to read from / save to
 
     Returns:
         Route dict with geometry, or None if failed
     """
+    if cache is not None:
+        cached = cache.get(start, end, need_geometry=True)
+        if cached is not None:
+            return _route_result(cached["distance_m"], cached["duration_s"],
+                                 cached["coordinates"])
+
     coords = f"{start['lon']},{start['lat']};{end['lon']},{end['lat']}"
     url = f"https://router.project-osrm.org/route/v1/driving/{coords}"
 
     try:
-        response = requests.get(url, params={
+        response = http_get(url, params={
             "overview": "full",
-            "geometries": "geojson",
+            "geometries": "polyline6",
             "steps": "true"
         }, timeout=10)
 
@@ -379,13 +930,10 @@ def get_route_with_geometry(start: dict, end: dict) -> Optional[dict]:
 
         if data.get("code") == "Ok" and data.get("routes"):
             route = data["routes"][0]
-            return {
-                "distance_km": round(route["distance"] / 1000, 2),
-                "duration_min": round(route["duration"] / 60, 1),
-                "geometry": route["geometry"],
-                "coordinates": route["geometry"]["coordinates"],
-                "num_points": len(route["geometry"]["coordinates"])
-            }
+            geometry = RouteGeometry(route["geometry"])
+            if cache is not None:
+                cache.put(start, end, route["distance"], route["duration"], geometry)
+            return _route_result(route["distance"], route["duration"], geometry)
 
     except requests.RequestException as e:
         print(f"Request error: {e}")
@@ -409,6 +957,7 @@ def example_route_geometry():
         print(f"Distance: {route['distance_km']} km")
         print(f"Duration: {route['duration_min']} min")
         print(f"Geometry points: {route['num_points']}")
+        print(f"Encoded polyline: {len(route['polyline'])} characters")
         print(f"First 3 coordinates: {route['coordinates'][:3]}")
         print(f"Last 3 coordinates: {route['coordinates'][-3:]}")
     else:
@@ -510,6 +1059,8 @@ def route_to_geojson(route: dict, start_name: str, end_name: str) -> dict:
         GeoJSON FeatureCollection
     """
     coords = route.get("coordinates", [])
+    if isinstance(coords, RouteGeometry):
+        coords = coords.lonlat()
 
     features = [
         {
@@ -589,57 +1140,18 @@ class RouteAnalyzer:
     def _haversine(self, lat1: float, lon1: float,
                    lat2: float, lon2: float) -> float:
         """Calculate straight-line distance in km."""
-        R = 6371.0
-        lat1_r, lat2_r = math.radians(lat1), math.radians(lat2)
-        dlat = math.radians(lat2 - lat1)
-        dlon = math.radians(lon2 - lon1)
-
-        a = (math.sin(dlat/2)**2 +
-             math.cos(lat1_r) * math.cos(lat2_r) * math.sin(dlon/2)**2)
-        return R * 2 * math.asin(math.sqrt(a))
+        return haversine_batch([(lat1, lon1)], [(lat2, lon2)])[0]
 
-    def build_haversine_matrix(self) -> list[list[float]]:
+    def build_haversine_matrix(self) -> SymmetricMatrix:
         """Build straight-line distance matrix."""
-        n = len(self.locations)
-        self.haversine_matrix = [[0.0]*n for _ in range(n)]
-
-        for i in range(n):
-            for j in range(n):
-                if i != j:
-                    self.haversine_matrix[i][j] = round(self._haversine(
-                        self.locations[i]['lat'], self.locations[i]['lon'],
-                        self.locations[j]['lat'], self.locations[j]['lon']
-                    ), 2)
-
+        self.haversine_matrix = build_haversine_matrix(self.locations)
         return self.haversine_matrix
 
-    def build_osrm_matrix(self) -> tuple[list[list[float]], list[list[float]]]:
-        """Build driving distance/duration matrices."""
-        coords = ";".join(f"{loc['lon']},{loc['lat']}" for loc in self.locations)
-        url = f"{self.OSRM_BASE}/table/v1/driving/{coords}"
-
-        try:
-            response = requests.get(url, params={"annotations": "distance,duration"}, timeout=30)
-            data = response.json()
-
-            if data.get("code") == "Ok":
-                self.osrm_distance_matrix = [
-                    [round(d/1000, 2) if d else 0 for d in row]
-                    for row in data.get("distances", [])
-                ]
-                self.osrm_duration_matrix = [
-                    [round(d/60, 1) if d else 0 for d in row]
-                    for row in data.get("durations", [])
-                ]
-            else:
-                raise ValueError(f"OSRM error: {data.get('code')}")
-
-        except Exception as e:
-            print(f"Error: {e}")
-            n = len(self.locations)
-            self.osrm_distance_matrix = [[0.0]*n for _ in range(n)]
-            self.osrm_duration_matrix = [[0.0]*n for _ in range(n)]
-
+    def build_osrm_matrix(self) -> tuple[list[list], list[list]]:
+        """Build driving distance/duration matrices (None = no route)."""
+        self.osrm_distance_matrix, self.osrm_duration_matrix = get_osrm_table_tiled(
+            self.locations, base_url=self.OSRM_BASE
+        )
         return self.osrm_distance_matrix, self.osrm_duration_matrix
 
     def analyze_all(self) -> dict:
@@ -656,7 +1168,10 @@ class RouteAnalyzer:
                     h = self.haversine_matrix[i][j]
                     d = self.osrm_distance_matrix[i][j]
                     t = self.osrm_duration_matrix[i][j]
-                    ratio = round(d / h, 2) if h > 0 else 0
+                    if d is None:
+                        ratio = None
+                    else:
+                        ratio = round(d / h, 2) if h > 0 else 0
 
                     comparisons.append({
                         "from": self.locations[i]['name'],
@@ -692,10 +1207,13 @@ class RouteAnalyzer:
                     h = self.haversine_matrix[i][j]
                     d = self.osrm_distance_matrix[i][j]
                     t = self.osrm_duration_matrix[i][j]
-                    ratio = d / h if h > 0 else 0
 
                     print(f"\n{self.locations[i]['name']} → {self.locations[j]['name']}")
                     print(f"  Straight-line: {h:>7.2f} km")
+                    if d is None or t is None:
+                        print("  Driving:       no route")
+                        continue
+                    ratio = d / h if h > 0 else 0
                     print(f"  Driving:       {d:>7.2f} km ({t:.0f} min)")
                     print(f"  Ratio:         {ratio:>7.2f}x")
 
@@ -723,6 +1241,201 @@ def example_route_analyzer():
     print(f"\nTotal comparisons: {len(results['comparisons'])}")
 
 
+# =============================================================================
+# Example 11: Persistent Route Cache
+# =============================================================================
+
+class RouteCache:
+    """
+    On-disk cache of OSRM results, keyed on (profile, start, end).
+
+    Coordinates are rounded to `precision` decimals before lookup, so
+    requests from "the same place" (5 decimals ≈ 1 m) share one entry.
+    Distance and duration are stored exactly; geometry is stored as the
+    encoded polyline6 string. Everything lives in one SQLite file, so the
+    cache survives restarts.
+    """
+
+    def __init__(self, path: str = ".route_cache.sqlite", precision: int = 5):
+        self.precision = precision
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS routes (
+                profile    TEXT NOT NULL,
+                start_lat  REAL NOT NULL,
+                start_lon  REAL NOT NULL,
+                end_lat    REAL NOT NULL,
+                end_lon    REAL NOT NULL,
+                distance_m REAL NOT NULL,
+                duration_s REAL NOT NULL,
+                geometry   TEXT,
+                PRIMARY KEY (profile, start_lat, start_lon, end_lat, end_lon)
+            )
+        """)
+        self.conn.commit()
+
+    def _key(self, start: dict, end: dict, profile: str) -> tuple:
+        """Snap both points to the cache grid."""
+        p = self.precision
+        return (profile, round(start["lat"], p), round(start["lon"], p),
+                round(end["lat"], p), round(end["lon"], p))
+
+    def get(self, start: dict, end: dict, profile: str = "driving",
+            need_geometry: bool = False) -> Optional[dict]:
+        """
+        Look up a route.
+
+        Returns:
+            Dict with distance_m, duration_s and coordinates (a
+            RouteGeometry, or None if no geometry was stored), or None on a miss. With need_geometry=True,
+            an entry without geometry counts as a miss.
+        """
+        row = self.conn.execute(
+            """SELECT distance_m, duration_s, geometry FROM routes
+               WHERE profile = ? AND start_lat = ? AND start_lon = ?
+                 AND end_lat = ? AND end_lon = ?""",
+            self._key(start, end, profile)
+        ).fetchone()
+
+        if row is None or (need_geometry and row[2] is None):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        distance_m, duration_s, geometry = row
+        coordinates = RouteGeometry(geometry) if geometry else None
+        return {"distance_m": distance_m, "duration_s": duration_s,
+                "coordinates": coordinates}
+
+    def put(self, start: dict, end: dict, distance_m: float, duration_s: float,
+            coordinates=None, profile: str = "driving") -> None:
+        """
+        Save a route. Existing geometry is kept if none is given.
+
+        coordinates may be a RouteGeometry or a list of [lon, lat] pairs.
+        """
+        geometry = None
+        if coordinates is not None:
+            if not isinstance(coordinates, RouteGeometry):
+                coordinates = RouteGeometry.from_coordinates(coordinates)
+            geometry = coordinates.encoded
+        self._upsert(start, end, distance_m, duration_s, geometry, profile)
+        self.conn.commit()
+
+    def _upsert(self, start: dict, end: dict, distance_m: float, duration_s: float,
+                geometry: Optional[str], profile: str) -> None:
+        """Write one row without committing (callers batch the commit)."""
+        self.conn.execute(
+            """INSERT INTO routes VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT (profile, start_lat, start_lon, end_lat, end_lon) DO UPDATE SET
+                   distance_m = excluded.distance_m,
+                   duration_s = excluded.duration_s,
+                   geometry = COALESCE(excluded.geometry, routes.geometry)""",
+            (*self._key(start, end, profile), distance_m, duration_s, geometry)
+        )
+
+    def get_many(self, pairs: list[tuple[dict, dict]],
+                 profile: str = "driving") -> list[Optional[dict]]:
+        """
+        Distance/duration for many (start, end) pairs, in input order.
+
+        Only the pairs missing from the cache are fetched, with
+        get_osrm_pairs (one one-to-many request per origin, not a full
+        origins × targets matrix), and then saved in one transaction.
+
+        Returns:
+            One dict per pair (distance_m, duration_s, coordinates), or None
+            where OSRM has no route
+        """
+        results = [self.get(start, end, profile) for start, end in pairs]
+        missing = [k for k, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+
+        # Unique snapped origins/destinations of the missing pairs
+        origins: dict[tuple, int] = {}
+        targets: dict[tuple, int] = {}
+        for k in missing:
+            start, end = pairs[k]
+            origins.setdefault(self._key(start, start, profile)[1:3], len(origins))
+            targets.setdefault(self._key(end, end, profile)[1:3], len(targets))
+
+        cells = {}  # position in pairs -> (origin index, target index)
+        for k in missing:
+            start, end = pairs[k]
+            cells[k] = (origins[self._key(start, start, profile)[1:3]],
+                        targets[self._key(end, end, profile)[1:3]])
+
+        fetched = get_osrm_pairs(
+            [{"lat": lat, "lon": lon} for lat, lon in origins],
+            [{"lat": lat, "lon": lon} for lat, lon in targets],
+            list(cells.values()), profile=profile
+        )
+
+        with self.conn:  # one commit for the whole batch
+            for k, cell in cells.items():
+                if cell not in fetched:
+                    continue
+                d, t = fetched[cell]
+                start, end = pairs[k]
+                self._upsert(start, end, d, t, None, profile)
+                results[k] = {"distance_m": d, "duration_s": t, "coordinates": None}
+        return results
+
+    def stats(self) -> dict:
+        count = self.conn.execute("SELECT COUNT(*) FROM routes").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {"entries": count, "hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0}
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def example_route_cache():
+    """Demonstrate the persistent route cache."""
+    print("\n" + "="*60)
+    print("Example 11: Persistent Route Cache")
+    print("="*60)
+
+    cache = RouteCache(".week08_route_cache.sqlite")
+    campus = {"name": "Main Station", "lat": 25.0478, "lon": 121.5170}
+    places = [
+        {"name": "Taipei 101", "lat": 25.0330, "lon": 121.5654},
+        {"name": "Palace Museum", "lat": 25.1024, "lon": 121.5485},
+        {"name": "Shilin Market", "lat": 25.0881, "lon": 121.5240},
+    ]
+
+    print("\nFirst request (fetched from OSRM, then saved):")
+    start_time = time.time()
+    route = get_route_with_geometry(campus, places[0], cache=cache)
+    if route:
+        print(f"  {route['distance_km']} km, {route['duration_min']} min "
+              f"in {time.time() - start_time:.2f}s")
+
+    print("\nSame request again (from the cache, survives restarts):")
+    start_time = time.time()
+    route = get_route_with_geometry(campus, places[0], cache=cache)
+    if route:
+        print(f"  {route['distance_km']} km, {route['duration_min']} min "
+              f"in {(time.time() - start_time) * 1000:.1f} ms")
+
+    print("\nBulk lookup (only uncached pairs go to OSRM):")
+    results = cache.get_many([(campus, place) for place in places])
+    for place, result in zip(places, results):
+        if result:
+            print(f"  → {place['name']}: {result['distance_m'] / 1000:.2f} km, "
+                  f"{result['duration_s'] / 60:.1f} min")
+        else:
+            print(f"  → {place['name']}: no route")
+
+    print(f"\nCache stats: {cache.stats()}")
+    cache.close()
+
+
 # =============================================================================
 # Main Menu
 # =============================================================================
@@ -742,6 +1455,7 @@ def show_menu():
     print("8.  ASCII Route Visualization")
     print("9.  Export to GeoJSON")
     print("10. Complete Route Analyzer")
+    print("11. Persistent Route Cache")
     print("0.  Run All Examples")
     print("q.  Quit")
     print("-"*60)
@@ -760,11 +1474,12 @@ def main():
         '8': example_ascii_visualization,
         '9': example_geojson_export,
         '10': example_route_analyzer,
+        '11': example_route_cache,
     }
 
     while True:
         show_menu()
-        choice = input("Select an example (0-10, q to quit): ").strip().lower()
+        choice = input("Select an example (0-11, q to quit): ").strip().lower()
 
         if choice == 'q':
             print("Goodbye!")
@@ -775,7 +1490,7 @@ def main():
                 time.sleep(1)  # Rate limiting between API calls
         elif choice in examples:
             examples[choice]()
-            if choice in ['2', '5', '6', '7', '8', '9', '10']:
+            if choice in ['2', '5', '6', '7', '8', '9', '10', '11']:
                 time.sleep(1)  # Rate limiting for API examples
         else:
             print("Invalid choice. Please try again.")
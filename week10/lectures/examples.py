@@ -6,6 +6,10 @@ This module demonstrates:
 - Graph representation with adjacency matrices
 - Permutations and factorial growth
 - Brute force algorithm for TSP
+- Running brute force in parallel across CPU cores
+- Branch and bound pruning for exact search
+- 2-opt / Or-opt local search to improve heuristic routes
+- Held-Karp dynamic programming for larger tours
 - Route optimization for restaurant tours
 - Integration concepts with real distance calculations
 
@@ -16,11 +20,21 @@ Or run with interactive menu:
     python examples.py --interactive
 """
 
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from itertools import permutations
+import multiprocessing
+import os
 from typing import List, Dict, Any, Tuple, Optional
 import math
 import time
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 
 # =============================================================================
 # SECTION 1: SAMPLE DATA
@@ -89,6 +103,18 @@ def calculate_route_distance(route: List[int], distance_matrix: List[List[float]
     return total
 
 
+def _submatrix(distance_matrix, nodes: List[int]) -> Dict[int, Dict[int, float]]:
+    """
+    Copy the distances between nodes into plain dicts, keyed by node index.
+
+    Solvers that read the same cells millions of times call this once, so
+    their inner loops do dict lookups instead of going through a matrix
+    class (e.g. SymmetricMatrix row views). Routes keep their original
+    node indices, so calculate_route_distance works on the copy as is.
+    """
+    return {a: {b: distance_matrix[a][b] for b in nodes} for a in nodes}
+
+
 def demo_adjacency_matrix():
     """Demonstrate adjacency matrix representation."""
     print("\n" + "=" * 60)
@@ -252,10 +278,11 @@ def find_optimal_route_brute_force(
     best_route = None
     best_distance = float('inf')
     checked = 0
+    dist = _submatrix(distance_matrix, [start] + list(places_to_visit))
 
     for perm in permutations(places_to_visit):
         route = [start] + list(perm)
-        distance = calculate_route_distance(route, distance_matrix)
+        distance = calculate_route_distance(route, dist)
         checked += 1
 
         if verbose:
@@ -305,10 +332,11 @@ def find_optimal_round_trip(
     """Find optimal route that returns to start."""
     best_route = None
     best_distance = float('inf')
+    dist = _submatrix(distance_matrix, [start] + list(places_to_visit))
 
     for perm in permutations(places_to_visit):
         route = [start] + list(perm) + [start]
-        distance = calculate_route_distance(route, distance_matrix)
+        distance = calculate_route_distance(route, dist)
 
         if distance < best_distance:
             best_distance = distance
@@ -384,8 +412,374 @@ def demo_benchmark():
 
 
 # =============================================================================
-# SECTION 6: HAVERSINE DISTANCE
+# SECTION 6: PARALLEL BRUTE FORCE
+# =============================================================================
+
+# Per-process state, filled in by _init_brute_force_worker
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_brute_force_worker(from_start, dist, to_start, shared_best) -> None:
+    """Store the distance tables and the shared best distance in each worker."""
+    _worker_state["from_start"] = from_start
+    _worker_state["dist"] = dist
+    _worker_state["to_start"] = to_start
+    _worker_state["shared_best"] = shared_best
+
+
+def _search_prefix(prefix: Tuple[int, ...]) -> Tuple[float, Optional[Tuple[int, ...]]]:
+    """
+    Search every route that begins with `prefix` (a worker task).
+
+    Extends the route one stop at a time, in the same order as
+    permutations(), and abandons a branch as soon as its partial distance
+    is already longer than the best complete route found by any worker.
+    Returns (best_distance, best_order) for this prefix.
+    """
+    from_start = _worker_state["from_start"]
+    dist = _worker_state["dist"]
+    to_start = _worker_state["to_start"]
+    shared_best = _worker_state["shared_best"]
+
+    best = [float('inf'), None]
+    bound = [shared_best.value]
+    path = list(prefix)
+
+    def extend(cost: float, remaining: List[int]) -> None:
+        if len(remaining) >= 3:
+            bound[0] = min(bound[0], shared_best.value)
+        if cost > bound[0]:
+            return
+
+        if not remaining:
+            total = cost + to_start[path[-1]] if to_start else cost
+            if total < best[0]:
+                best[0], best[1] = total, tuple(path)
+                bound[0] = min(bound[0], total)
+                with shared_best.get_lock():
+                    if total < shared_best.value:
+                        shared_best.value = total
+            return
+
+        last = path[-1]
+        for idx, nxt in enumerate(remaining):
+            path.append(nxt)
+            extend(cost + dist[last][nxt], remaining[:idx] + remaining[idx + 1:])
+            path.pop()
+
+    cost = from_start[prefix[0]]
+    for a, b in zip(prefix, prefix[1:]):
+        cost += dist[a][b]
+    extend(cost, [i for i in range(len(from_start)) if i not in prefix])
+
+    return best[0], best[1]
+
+
+def find_optimal_route_parallel(
+    start: int,
+    places_to_visit: List[int],
+    distance_matrix: List[List[float]],
+    return_to_start: bool = False,
+    max_workers: Optional[int] = None,
+    prefix_length: Optional[int] = None
+) -> Tuple[List[int], float]:
+    """
+    Find the optimal route with brute force spread over several CPU cores.
+
+    The permutations are split by their first one or two stops, and each
+    group is searched by a separate process. Workers share the best
+    distance found so far and skip any partial route that is already
+    longer. When several routes tie, the one that comes first in
+    permutations() order wins, so the answer is exactly what
+    find_optimal_route_brute_force / find_optimal_round_trip return.
+
+    Pruning assumes distances are never negative.
+
+    Args:
+        start: Index of starting location
+        places_to_visit: List of indices to visit
+        distance_matrix: 2D distance matrix
+        return_to_start: If True, the route ends back at start
+        max_workers: Number of processes (default: all CPU cores)
+        prefix_length: Fixed stops per task, 1 or 2 (default: picked from N)
+
+    Returns:
+        Tuple of (best_route, best_distance)
+    """
+    nodes = list(places_to_visit)
+    k = len(nodes)
+    if k < 4:
+        if return_to_start:
+            return find_optimal_round_trip(start, nodes, distance_matrix)
+        return find_optimal_route_brute_force(start, nodes, distance_matrix)
+
+    workers = max_workers or os.cpu_count() or 1
+    if prefix_length is None:
+        prefix_length = 1 if k >= 2 * workers else 2
+
+    from_start = [distance_matrix[start][p] for p in nodes]
+    dist = [[distance_matrix[a][b] for b in nodes] for a in nodes]
+    to_start = [distance_matrix[p][start] for p in nodes] if return_to_start else None
+
+    # A quick greedy route gives workers an upper bound to prune against
+    greedy, _ = nearest_neighbor_route(start, nodes, distance_matrix)
+    if return_to_start:
+        greedy = greedy + [start]
+    shared_best = multiprocessing.Value('d', calculate_route_distance(greedy, distance_matrix))
+
+    prefixes = list(permutations(range(k), prefix_length))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_brute_force_worker,
+        initargs=(from_start, dist, to_start, shared_best)
+    ) as pool:
+        results = list(pool.map(_search_prefix, prefixes))
+
+    # Ties go to the earliest route in permutations() order
+    best_distance, best_order = min(
+        (r for r in results if r[1] is not None),
+        key=lambda r: (r[0], r[1])
+    )
+
+    route = [start] + [nodes[i] for i in best_order]
+    if return_to_start:
+        route.append(start)
+    return route, best_distance
+
+
+def demo_parallel_brute_force():
+    """Compare single-core and multi-core brute force."""
+    print("\n" + "=" * 60)
+    print("DEMO: Parallel Brute Force")
+    print("=" * 60)
+
+    print(f"\nCPU cores available: {os.cpu_count()}")
+    print(f"\n{'N':>4} | {'Single core':>12} | {'Parallel':>12} | {'Same answer?':>12}")
+    print("-" * 52)
+
+    for n in range(7, 10):
+        matrix = [[abs(i - j) * 1.5 + (i * j) % 7 for j in range(n + 1)] for i in range(n + 1)]
+        for i in range(n + 1):
+            matrix[i][i] = 0
+        places_to_visit = list(range(1, n + 1))
+
+        start_time = time.time()
+        serial = find_optimal_route_brute_force(0, places_to_visit, matrix)
+        serial_time = time.time() - start_time
+
+        start_time = time.time()
+        parallel = find_optimal_route_parallel(0, places_to_visit, matrix)
+        parallel_time = time.time() - start_time
+
+        same = "✓" if serial == parallel else "✗"
+        print(f"{n:>4} | {serial_time:>11.3f}s | {parallel_time:>11.3f}s | {same:>12}")
+
+    print("-" * 52)
+    print("\n📌 Pruning skips most partial routes; the cores split whatever is left.")
+    print("   Starting processes has a cost, so this pays off for 10+ stops.")
+
+
 # =============================================================================
+# SECTION 7: BRANCH AND BOUND
+# =============================================================================
+
+def find_optimal_route_branch_and_bound(
+    start: int,
+    places_to_visit: List[int],
+    distance_matrix: List[List[float]],
+    return_to_start: bool = False,
+    stats: Optional[Dict[str, int]] = None
+) -> Tuple[List[int], float]:
+    """
+    Find the optimal route with depth-first branch and bound.
+
+    Routes are built one stop at a time. Before extending a partial route
+    we compute a lower bound: its distance so far plus, for every stop not
+    yet visited, the cheapest edge that could lead into it. If even that
+    optimistic total is longer than the best complete route found so far,
+    the whole branch is skipped.
+
+    The search starts from a nearest neighbor + local search route, so
+    there is a good route to prune against from the first step. Ties are
+    broken the same way as the brute force functions, so the answer is
+    identical to find_optimal_route_brute_force / find_optimal_round_trip.
+
+    Args:
+        start: Index of starting location
+        places_to_visit: List of indices to visit
+        distance_matrix: 2D distance matrix (non-negative distances)
+        return_to_start: If True, the route ends back at start
+        stats: Optional dict, filled with "expanded", "pruned" and
+            "routes_completed" counts
+
+    Returns:
+        Tuple of (best_route, best_distance)
+    """
+    nodes = list(places_to_visit)
+    k = len(nodes)
+    counts = {"expanded": 0, "pruned": 0, "routes_completed": 0}
+    if k == 0:
+        if stats is not None:
+            stats.update(counts)
+        return ([start, start] if return_to_start else [start]), 0
+
+    from_start = [distance_matrix[start][p] for p in nodes]
+    dist = [[distance_matrix[a][b] for b in nodes] for a in nodes]
+    to_start = [distance_matrix[p][start] for p in nodes] if return_to_start else None
+
+    # Cheapest possible edge into each stop (from start or another stop)
+    min_in = [
+        min([from_start[u]] + [dist[v][u] for v in range(k) if v != u])
+        for u in range(k)
+    ]
+    min_back = min(to_start) if return_to_start else 0
+
+    # Initial upper bound from a quick heuristic route
+    greedy, _ = nearest_neighbor_route(start, nodes, distance_matrix)
+    if return_to_start:
+        greedy = greedy + [start]
+    greedy, greedy_distance = improve_route(greedy, distance_matrix, time_budget_s=0.1)
+    position = {p: i for i, p in enumerate(nodes)}
+    best = {
+        "distance": greedy_distance,
+        "order": tuple(position[p] for p in greedy[1:k + 1]),
+    }
+    tolerance = 1e-9 * max(1.0, abs(greedy_distance))
+
+    path: List[int] = []
+    visited = [False] * k
+
+    def search(cost: float, remaining_min_in: float) -> None:
+        bound = cost + remaining_min_in + min_back
+        if bound > best["distance"] + tolerance:
+            counts["pruned"] += 1
+            return
+
+        if len(path) == k:
+            counts["routes_completed"] += 1
+            total = cost + to_start[path[-1]] if return_to_start else cost
+            order = tuple(path)
+            # Equal distance: keep the route brute force would find first
+            if total < best["distance"] or (total == best["distance"] and order < best["order"]):
+                best["distance"], best["order"] = total, order
+            return
+
+        counts["expanded"] += 1
+        last = path[-1] if path else None
+        # Try the closest stops first to find good routes early
+        candidates = [u for u in range(k) if not visited[u]]
+        candidates.sort(key=lambda u: from_start[u] if last is None else dist[last][u])
+        for u in candidates:
+            step = from_start[u] if last is None else dist[last][u]
+            visited[u] = True
+            path.append(u)
+            search(cost + step, remaining_min_in - min_in[u])
+            path.pop()
+            visited[u] = False
+
+    search(0, sum(min_in))
+
+    if stats is not None:
+        stats.update(counts)
+
+    route = [start] + [nodes[i] for i in best["order"]]
+    if return_to_start:
+        route.append(start)
+    return route, best["distance"]
+
+
+def demo_branch_and_bound():
+    """Show how much of the search tree branch and bound skips."""
+    print("\n" + "=" * 60)
+    print("DEMO: Branch and Bound")
+    print("=" * 60)
+
+    import random
+    rng = random.Random(7)
+
+    print(f"\n{'N':>4} | {'Brute force routes':>18} | {'Expanded':>9} | {'Pruned':>9} | {'Time':>8}")
+    print("-" * 62)
+
+    for n in (6, 8, 10, 12, 14):
+        places = [{"lat": 25.0 + rng.random() * 0.05, "lon": 121.5 + rng.random() * 0.05}
+                  for _ in range(n + 1)]
+        matrix = build_distance_matrix_from_places(places)
+        places_to_visit = list(range(1, n + 1))
+
+        stats: Dict[str, int] = {}
+        start_time = time.time()
+        route, dist = find_optimal_route_branch_and_bound(0, places_to_visit, matrix, stats=stats)
+        elapsed = time.time() - start_time
+
+        if n <= 8:
+            assert (route, dist) == find_optimal_route_brute_force(0, places_to_visit, matrix)
+
+        print(f"{n:>4} | {math.factorial(n):>18,} | {stats['expanded']:>9,} | "
+              f"{stats['pruned']:>9,} | {elapsed:>7.3f}s")
+
+    print("-" * 62)
+    print("\n📌 Same optimal route as brute force, but most branches are never explored.")
+
+
+# =============================================================================
+# SECTION 8: HAVERSINE DISTANCE
+# =============================================================================
+
+EARTH_RADIUS_KM = 6371  # Earth's radius in km
+NUMPY_BATCH_MIN = 64  # NumPy only pays off for larger batches
+
+
+def haversine_batch(
+    origins: List[Tuple[float, float]],
+    destinations: List[Tuple[float, float]]
+) -> List[float]:
+    """
+    Calculate Haversine distances for many point pairs in one call.
+
+    Pair k goes from origins[k] to destinations[k]. Large batches run as
+    NumPy array operations when NumPy is installed; the plain-Python
+    fallback gives the same results.
+
+    Args:
+        origins: List of (lat, lon) tuples in degrees
+        destinations: List of (lat, lon) tuples in degrees (same length)
+
+    Returns:
+        List of distances in kilometers
+    """
+    if len(origins) != len(destinations):
+        raise ValueError("origins and destinations must have the same length")
+
+    if NUMPY_AVAILABLE and len(origins) >= NUMPY_BATCH_MIN:
+        p1 = np.asarray(origins, dtype=float)
+        p2 = np.asarray(destinations, dtype=float)
+        return _haversine_numpy(p1, p2).tolist()
+
+    distances = []
+    for (lat1, lon1), (lat2, lon2) in zip(origins, destinations):
+        lat1 = math.radians(lat1)
+        lat2 = math.radians(lat2)
+        dlat = lat2 - lat1
+        dlon = math.radians(lon2 - lon1)
+
+        a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+        c = 2 * math.asin(math.sqrt(a))
+        distances.append(EARTH_RADIUS_KM * c)
+
+    return distances
+
+
+def _haversine_numpy(p1, p2):
+    """Array form of the formula above; p1 and p2 are (m, 2) lat/lon arrays."""
+    lat1 = np.radians(p1[:, 0])
+    lat2 = np.radians(p2[:, 0])
+    dlat = lat2 - lat1
+    dlon = np.radians(p2[:, 1] - p1[:, 1])
+
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    c = 2 * np.arcsin(np.sqrt(a))
+    return EARTH_RADIUS_KM * c
+
 
 def haversine_distance(p1: Dict[str, Any], p2: Dict[str, Any]) -> float:
     """
@@ -398,44 +792,233 @@ def haversine_distance(p1: Dict[str, Any], p2: Dict[str, Any]) -> float:
     Returns:
         Distance in kilometers
     """
-    R = 6371  # Earth's radius in km
+    return haversine_batch([(p1["lat"], p1["lon"])], [(p2["lat"], p2["lon"])])[0]
 
-    lat1 = math.radians(p1["lat"])
-    lat2 = math.radians(p2["lat"])
-    dlat = lat2 - lat1
-    dlon = math.radians(p2["lon"] - p1["lon"])
 
-    a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
-    c = 2 * math.asin(math.sqrt(a))
+def _scaled_distances(origins, destinations, scale: float = 1.0,
+                      ndigits: Optional[int] = None) -> array:
+    """
+    Haversine km × scale for each pair, rounded the same way on every path.
+
+    SymmetricMatrix.from_points and RestaurantTourPlanner.add_restaurant
+    both go through here, so a matrix grown one point at a time matches
+    one rebuilt from scratch value for value. With NumPy the math and the
+    rounding are np functions, whatever the batch size; without it, both
+    are plain Python.
+    """
+    if len(origins) == 0:
+        return array('d')
+    if NUMPY_AVAILABLE:
+        values = _haversine_numpy(np.asarray(origins, dtype=float),
+                                  np.asarray(destinations, dtype=float)) * scale
+        if ndigits is not None:
+            values = np.round(values, ndigits)
+        return array('d', values.astype(float).tobytes())
+
+    distances = haversine_batch(origins, destinations)
+    if ndigits is None:
+        return array('d', (d * scale for d in distances))
+    return array('d', (round(d * scale, ndigits) for d in distances))
+
+
+class SymmetricMatrix:
+    """
+    Half-storage matrix for symmetric distances (matrix[i][j] == matrix[j][i]).
+
+    Haversine walking times are the same in both directions and the
+    diagonal is 0, so we keep only the n*(n-1)/2 entries above the
+    diagonal in a flat array('d'), packed column by column:
+
+        index(i, j) = j*(j-1)/2 + i   for i < j
 
-    return R * c
+    It reads like a List[List[float]]: matrix[i][j], len(matrix) and
+    iterating over rows all work unchanged.
+    """
+
+    def __init__(self, n: int, values=None):
+        """Create an n×n matrix from packed values (zeros if omitted)."""
+        size = n * (n - 1) // 2
+        if values is None:
+            self._data = array('d', bytes(8 * size))
+        else:
+            self._data = array('d', values)
+        if len(self._data) != size:
+            raise ValueError(f"Expected {size} packed values, got {len(self._data)}")
+        self.n = n
+
+    @classmethod
+    def from_points(
+        cls,
+        points: List[Tuple[float, float]],
+        scale: float = 1.0,
+        ndigits: Optional[int] = None
+    ) -> 'SymmetricMatrix':
+        """
+        Build a matrix of Haversine distances in one batch pass.
+
+        Args:
+            points: List of (lat, lon) tuples
+            scale: Factor applied to every distance in km (e.g. km → minutes)
+            ndigits: Decimal places to round to (None = keep full precision)
+
+        Returns:
+            SymmetricMatrix of scaled distances
+        """
+        n = len(points)
+        matrix = cls(n)
+        if n < 2:
+            return matrix
+
+        if NUMPY_AVAILABLE:
+            pts = np.asarray(points, dtype=float)
+            # Row-major lower triangle of (j, i) matches the packed order
+            cols, rows = np.tril_indices(n, -1)
+            matrix._data = _scaled_distances(pts[rows], pts[cols], scale, ndigits)
+            return matrix
+
+        # One column at a time, so only O(n) temporary lists exist at once
+        data = array('d')
+        for j in range(1, n):
+            data.extend(_scaled_distances(points[:j], [points[j]] * j, scale, ndigits))
+        matrix._data = data
+        return matrix
+
+    def _index(self, i: int, j: int) -> int:
+        if i > j:
+            i, j = j, i
+        return j * (j - 1) // 2 + i
+
+    def get(self, i: int, j: int) -> float:
+        """Return the value at row i, column j."""
+        if not (0 <= i < self.n and 0 <= j < self.n):
+            raise IndexError(f"({i}, {j}) out of range for {self.n}x{self.n} matrix")
+        if i == j:
+            return 0.0
+        return self._data[self._index(i, j)]
+
+    def set(self, i: int, j: int, value: float) -> None:
+        """Set both [i][j] and [j][i] to value."""
+        if i == j:
+            raise ValueError("Diagonal of a SymmetricMatrix is always 0")
+        if not (0 <= i < self.n and 0 <= j < self.n):
+            raise IndexError(f"({i}, {j}) out of range for {self.n}x{self.n} matrix")
+        self._data[self._index(i, j)] = value
+
+    def __getitem__(self, key):
+        """matrix[i] gives a row view, matrix[i, j] gives a value."""
+        if isinstance(key, tuple):
+            return self.get(*key)
+        if key < 0:
+            key += self.n
+        if not 0 <= key < self.n:
+            raise IndexError(f"Row {key} out of range")
+        return _SymmetricRow(self, key)
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __iter__(self):
+        for i in range(self.n):
+            yield _SymmetricRow(self, i)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the packed values."""
+        return len(self._data) * self._data.itemsize
+
+    def append(self, distances: List[float]) -> int:
+        """
+        Add one more point, given its distance to each existing point.
+
+        Thanks to the column-packed layout, the new column goes at the end
+        of the array, so nothing else moves. Returns the new point's index.
+        """
+        if len(distances) != self.n:
+            raise ValueError(f"Expected {self.n} distances, got {len(distances)}")
+        self._data.extend(distances)
+        self.n += 1
+        return self.n - 1
+
+    def remove(self, k: int) -> None:
+        """
+        Remove point k, shifting later points down by one index.
+
+        Columns before k are untouched; later columns are compacted in
+        place, one slice copy at a time.
+        """
+        if not 0 <= k < self.n:
+            raise IndexError(f"Point {k} out of range")
+        data = self._data
+        write = k * (k - 1) // 2  # column k starts here and is dropped
+        for j in range(k + 1, self.n):
+            start = j * (j - 1) // 2
+            # Column j keeps rows 0..k-1 and k+1..j-1 (row k is dropped)
+            data[write:write + k] = data[start:start + k]
+            write += k
+            rest = j - k - 1
+            data[write:write + rest] = data[start + k + 1:start + j]
+            write += rest
+        del data[write:]
+        self.n -= 1
+
+    def to_list(self) -> List[List[float]]:
+        """Expand into a regular n×n 2D list."""
+        return [list(row) for row in self]
+
+    def __repr__(self) -> str:
+        return f"SymmetricMatrix(n={self.n}, stored={len(self._data)})"
+
+
+class _SymmetricRow:
+    """Read-only view of one row of a SymmetricMatrix."""
+
+    def __init__(self, matrix: SymmetricMatrix, i: int):
+        self._matrix = matrix
+        self._i = i
+
+    def __getitem__(self, j: int) -> float:
+        # Same as matrix.get(i, j), inlined: this is the hot path for m[i][j]
+        i, n = self._i, self._matrix.n
+        if j < 0:
+            j += n
+        if not 0 <= j < n:
+            raise IndexError(f"({i}, {j}) out of range for {n}x{n} matrix")
+        if i == j:
+            return 0.0
+        if i > j:
+            i, j = j, i
+        return self._matrix._data[j * (j - 1) // 2 + i]
+
+    def __len__(self) -> int:
+        return self._matrix.n
+
+    def __iter__(self):
+        for j in range(self._matrix.n):
+            yield self._matrix.get(self._i, j)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
 
 
 def build_distance_matrix_from_places(
     places: List[Dict[str, Any]],
     walking_speed_kmh: float = 5.0
-) -> List[List[float]]:
+) -> SymmetricMatrix:
     """
     Build distance matrix from places using Haversine formula.
 
+    Walking time A→B equals B→A, so each pair is computed once and the
+    result is a SymmetricMatrix (read it as matrix[i][j], like a 2D list).
+
     Args:
         places: List of places with lat/lon coordinates
         walking_speed_kmh: Walking speed in km/h (default 5 km/h)
 
     Returns:
-        2D matrix of walking times in minutes
+        Symmetric matrix of walking times in minutes
     """
-    n = len(places)
-    matrix = [[0.0] * n for _ in range(n)]
-
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                dist_km = haversine_distance(places[i], places[j])
-                time_min = (dist_km / walking_speed_kmh) * 60
-                matrix[i][j] = round(time_min, 1)
-
-    return matrix
+    points = [(p["lat"], p["lon"]) for p in places]
+    return SymmetricMatrix.from_points(points, scale=60 / walking_speed_kmh, ndigits=1)
 
 
 def demo_haversine():
@@ -472,7 +1055,7 @@ def demo_haversine():
 
 
 # =============================================================================
-# SECTION 7: NEAREST NEIGHBOR HEURISTIC
+# SECTION 9: NEAREST NEIGHBOR HEURISTIC
 # =============================================================================
 
 def nearest_neighbor_route(
@@ -566,27 +1149,421 @@ def demo_nearest_neighbor():
 
 
 # =============================================================================
-# SECTION 8: COMPLETE RESTAURANT TOUR PLANNER
+# SECTION 10: LOCAL SEARCH (2-OPT / OR-OPT)
+# =============================================================================
+
+def improve_route(
+    route: List[int],
+    distance_matrix: List[List[float]],
+    time_budget_s: float = 1.0,
+    max_iterations: int = 10_000,
+    neighbors: int = 10
+) -> Tuple[List[int], float]:
+    """
+    Improve a route with 2-opt and Or-opt local search.
+
+    Takes any starting route (e.g. from nearest_neighbor_route) and keeps
+    applying small changes that make it shorter:
+        - 2-opt: reverse a stretch of the route to remove a "crossing"
+        - Or-opt: move a chain of 1-3 stops to a better spot in the route
+
+    The first stop never moves. If the route ends where it started
+    (a round trip), the last stop stays fixed too. Only moves toward each
+    stop's `neighbors` closest stops are tried, so each pass is fast even
+    for hundreds of stops. Move gains assume a symmetric matrix, as with
+    Haversine distances.
+
+    Args:
+        route: Starting route (list of node indices)
+        distance_matrix: 2D distance matrix
+        time_budget_s: Stop searching after this many seconds
+        max_iterations: Stop after this many improving moves
+        neighbors: How many nearest stops to consider for each move
+
+    Returns:
+        Tuple of (improved_route, total_distance), never worse than the input
+    """
+    started = time.perf_counter()
+    original_distance = calculate_route_distance(route, distance_matrix)
+
+    round_trip = len(route) > 2 and route[0] == route[-1]
+    nodes = route[:-1] if round_trip else list(route)
+    n = len(nodes)
+    if n < 3:
+        return list(route), original_distance
+
+    # Work with local ids 0..n-1 (positions in the input route)
+    d = [[distance_matrix[a][b] for b in nodes] for a in nodes]
+    near = [
+        sorted((x for x in range(n) if x != a), key=lambda x: d[a][x])[:neighbors]
+        for a in range(n)
+    ]
+    tour = list(range(n)) + ([0] if round_trip else [])
+    last = len(tour) - 1            # index of the final position
+    hi = last - 1 if round_trip else last  # last position allowed to move
+    pos = list(range(n))
+    eps = 1e-9
+    iterations = 0
+
+    def out_of_time() -> bool:
+        return (iterations >= max_iterations
+                or time.perf_counter() - started > time_budget_s)
+
+    def two_opt_pass() -> bool:
+        nonlocal iterations
+        improved = False
+        for i in range(1, hi + 1):
+            if out_of_time():
+                return improved
+            a, b = tour[i - 1], tour[i]
+            d_ab = d[a][b]
+            for c in near[a]:
+                d_ac = d[a][c]
+                if d_ac >= d_ab:
+                    break
+                j = pos[c]
+                if j <= i or j > hi:
+                    continue
+                delta = d_ac - d_ab
+                if j < last:
+                    nxt = tour[j + 1]
+                    delta += d[b][nxt] - d[c][nxt]
+                if delta < -eps:
+                    tour[i:j + 1] = tour[i:j + 1][::-1]
+                    for k in range(i, j + 1):
+                        pos[tour[k]] = k
+                    iterations += 1
+                    improved = True
+                    break
+        return improved
+
+    def or_opt_pass() -> bool:
+        nonlocal iterations
+        improved = False
+        for length in (1, 2, 3):
+            i = 1
+            while i + length - 1 <= hi:
+                if out_of_time():
+                    return improved
+                seg_start, seg_end = tour[i], tour[i + length - 1]
+                prev = tour[i - 1]
+                has_next = i + length <= last
+                nxt = tour[i + length] if has_next else None
+
+                removal_gain = d[prev][seg_start]
+                if has_next:
+                    removal_gain += d[seg_end][nxt] - d[prev][nxt]
+
+                best_delta, best_move = -eps, None
+                for x in set(near[seg_start]) | set(near[seg_end]):
+                    k = pos[x]
+                    if i - 1 <= k <= i + length - 1 or k > hi:
+                        continue
+                    y = tour[k + 1] if k < last else None
+                    for reverse in (False, True):
+                        first, end = (seg_end, seg_start) if reverse else (seg_start, seg_end)
+                        added = d[x][first]
+                        if y is not None:
+                            added += d[end][y] - d[x][y]
+                        delta = added - removal_gain
+                        if delta < best_delta:
+                            best_delta, best_move = delta, (x, reverse)
+
+                if best_move is None:
+                    i += 1
+                    continue
+
+                x, reverse = best_move
+                segment = tour[i:i + length]
+                if reverse:
+                    segment.reverse()
+                del tour[i:i + length]
+                k = tour.index(x)
+                tour[k + 1:k + 1] = segment
+                for idx in range(hi + 1):
+                    pos[tour[idx]] = idx
+                iterations += 1
+                improved = True
+        return improved
+
+    improved = True
+    while improved and not out_of_time():
+        improved = two_opt_pass()
+        improved = or_opt_pass() or improved
+
+    best_route = [nodes[x] for x in tour]
+    best_distance = calculate_route_distance(best_route, distance_matrix)
+    if best_distance > original_distance:
+        return list(route), original_distance
+    return best_route, best_distance
+
+
+def demo_local_search():
+    """Improve nearest neighbor routes with 2-opt / Or-opt."""
+    print("\n" + "=" * 60)
+    print("DEMO: Local Search (2-opt / Or-opt)")
+    print("=" * 60)
+
+    print("\n--- Small example (6 locations) ---")
+    matrix = get_larger_distance_matrix()
+    nn_route, nn_dist = nearest_neighbor_route(0, [1, 2, 3, 4, 5], matrix)
+    ls_route, ls_dist = improve_route(nn_route, matrix)
+    bf_route, bf_dist = find_optimal_route_brute_force(0, [1, 2, 3, 4, 5], matrix)
+    print(f"  Nearest Neighbor: {nn_route} = {nn_dist} min")
+    print(f"  + Local Search:   {ls_route} = {ls_dist} min")
+    print(f"  Brute Force:      {bf_route} = {bf_dist} min")
+
+    print("\n--- Large tours (random places around Taipei) ---")
+    print(f"{'Stops':>6} | {'Nearest Nbr':>12} | {'Improved':>12} | {'Gain':>6} | {'Time':>8}")
+    print("-" * 58)
+
+    import random
+    rng = random.Random(42)
+    for n in (50, 100, 200):
+        places = [{"lat": 25.0 + rng.random() * 0.1, "lon": 121.5 + rng.random() * 0.1}
+                  for _ in range(n + 1)]
+        matrix = build_distance_matrix_from_places(places)
+        nn_route, nn_dist = nearest_neighbor_route(0, list(range(1, n + 1)), matrix)
+
+        start_time = time.time()
+        ls_route, ls_dist = improve_route(nn_route, matrix)
+        elapsed = time.time() - start_time
+
+        gain = (nn_dist - ls_dist) / nn_dist * 100
+        print(f"{n:>6} | {nn_dist:>8.1f} min | {ls_dist:>8.1f} min | {gain:>5.1f}% | {elapsed:>7.3f}s")
+
+    print("-" * 58)
+    print("\n📌 No guarantee of the optimum, but close to it, and fast for big N!")
+
+
+# =============================================================================
+# SECTION 11: HELD-KARP (DYNAMIC PROGRAMMING)
+# =============================================================================
+
+BRUTE_FORCE_LIMIT = 8  # Above this many stops, brute force gets too slow
+
+
+def _held_karp_python(
+    from_start: List[float],
+    dist: List[List[float]],
+    to_start: Optional[List[float]]
+) -> Tuple[List[int], float]:
+    """Plain-Python Held-Karp table; returns (visit order, distance)."""
+    k = len(from_start)
+    full = (1 << k) - 1
+    INF = float('inf')
+
+    # cost[mask][j]: shortest path from start through `mask`, ending at j
+    cost = [[INF] * k for _ in range(1 << k)]
+    parent = [[-1] * k for _ in range(1 << k)]
+    for j in range(k):
+        cost[1 << j][j] = from_start[j]
+
+    for mask in range(1, full + 1):
+        for j in range(k):
+            bit = 1 << j
+            if not mask & bit or mask == bit:
+                continue
+            prev = mask ^ bit
+            prev_cost = cost[prev]
+            best, best_i = INF, -1
+            for i in range(k):
+                if prev & (1 << i):
+                    candidate = prev_cost[i] + dist[i][j]
+                    if candidate < best:
+                        best, best_i = candidate, i
+            cost[mask][j] = best
+            parent[mask][j] = best_i
+
+    best_total, last = INF, -1
+    for j in range(k):
+        total = cost[full][j] + (to_start[j] if to_start else 0)
+        if total < best_total:
+            best_total, last = total, j
+
+    order = []
+    mask = full
+    while last != -1:
+        order.append(last)
+        last, mask = parent[mask][last], mask ^ (1 << last)
+    order.reverse()
+    return order, best_total
+
+
+def _held_karp_numpy(
+    from_start: List[float],
+    dist: List[List[float]],
+    to_start: Optional[List[float]]
+) -> Tuple[List[int], float]:
+    """NumPy Held-Karp: fills one whole subset-size layer per end node at a time."""
+    k = len(from_start)
+    full = (1 << k) - 1
+    d = np.asarray(dist, dtype=float)
+
+    cost = np.full((1 << k, k), np.inf)
+    parent = np.full((1 << k, k), -1, dtype=np.int8)
+    for j in range(k):
+        cost[1 << j, j] = from_start[j]
+
+    masks = np.arange(1 << k)
+    sizes = np.zeros(1 << k, dtype=np.int8)
+    for j in range(k):
+        sizes += (masks >> j) & 1
+
+    for size in range(2, k + 1):
+        layer = masks[sizes == size]
+        for j in range(k):
+            ending_at_j = layer[(layer >> j) & 1 == 1]
+            prev = ending_at_j ^ (1 << j)
+            candidates = cost[prev] + d[:, j]  # inf where i is not in prev
+            best_i = candidates.argmin(axis=1)
+            cost[ending_at_j, j] = candidates[np.arange(len(prev)), best_i]
+            parent[ending_at_j, j] = best_i
+
+    totals = cost[full] + (np.asarray(to_start, dtype=float) if to_start else 0)
+    last = int(totals.argmin())
+    best_total = float(totals[last])
+
+    order = []
+    mask = full
+    while last != -1:
+        order.append(last)
+        last, mask = int(parent[mask, last]), mask ^ (1 << last)
+    order.reverse()
+    return order, best_total
+
+
+def find_optimal_route_held_karp(
+    start: int,
+    places_to_visit: List[int],
+    distance_matrix: List[List[float]],
+    return_to_start: bool = False
+) -> Tuple[List[int], float]:
+    """
+    Find the optimal route using Held-Karp dynamic programming.
+
+    Instead of trying every order, remember the shortest way to reach each
+    state "visited this set of places, currently at place j". There are
+    2^N × N states, each checked against N predecessors: O(2^N × N²).
+    For N=15 that is ~7 million steps instead of 1.3 trillion routes.
+
+    Args:
+        start: Index of starting location
+        places_to_visit: List of indices to visit
+        distance_matrix: 2D distance matrix
+        return_to_start: If True, the route ends back at start
+
+    Returns:
+        Tuple of (best_route, best_distance), same as the brute force version
+    """
+    if not places_to_visit:
+        return ([start, start] if return_to_start else [start]), 0
+
+    nodes = list(places_to_visit)
+    from_start = [distance_matrix[start][p] for p in nodes]
+    dist = [[distance_matrix[a][b] for b in nodes] for a in nodes]
+    to_start = [distance_matrix[p][start] for p in nodes] if return_to_start else None
+
+    if NUMPY_AVAILABLE and len(nodes) > 1:
+        order, best_distance = _held_karp_numpy(from_start, dist, to_start)
+    else:
+        order, best_distance = _held_karp_python(from_start, dist, to_start)
+
+    route = [start] + [nodes[i] for i in order]
+    if return_to_start:
+        route.append(start)
+    return route, best_distance
+
+
+def demo_held_karp():
+    """Compare Held-Karp with brute force, then run it on bigger tours."""
+    print("\n" + "=" * 60)
+    print("DEMO: Held-Karp Dynamic Programming")
+    print("=" * 60)
+
+    matrix = get_larger_distance_matrix()
+    places_to_visit = [1, 2, 3, 4, 5]
+
+    print("\n--- Same answer as brute force (6 locations) ---")
+    bf_route, bf_dist = find_optimal_route_brute_force(0, places_to_visit, matrix)
+    hk_route, hk_dist = find_optimal_route_held_karp(0, places_to_visit, matrix)
+    print(f"  Brute Force: {bf_route} = {bf_dist} min")
+    print(f"  Held-Karp:   {hk_route} = {hk_dist:g} min")
+
+    bf_rt, bf_rt_dist = find_optimal_round_trip(0, places_to_visit, matrix)
+    hk_rt, hk_rt_dist = find_optimal_route_held_karp(
+        0, places_to_visit, matrix, return_to_start=True
+    )
+    print(f"  Round trip (brute force): {bf_rt} = {bf_rt_dist} min")
+    print(f"  Round trip (Held-Karp):   {hk_rt} = {hk_rt_dist:g} min")
+
+    print("\n--- Scaling up (where brute force gives up) ---")
+    print(f"{'N':>4} | {'Brute force routes':>20} | {'Held-Karp time':>14}")
+    print("-" * 46)
+
+    for n in range(8, 15, 2):
+        matrix = [[abs(i - j) * 1.5 + (i * j) % 7 for j in range(n + 1)] for i in range(n + 1)]
+        for i in range(n + 1):
+            matrix[i][i] = 0
+
+        start_time = time.time()
+        find_optimal_route_held_karp(0, list(range(1, n + 1)), matrix)
+        elapsed = time.time() - start_time
+
+        print(f"{n:>4} | {math.factorial(n):>20,} | {elapsed:>12.3f}s")
+
+    print("-" * 46)
+    print("\n📌 O(2^N × N²) grows fast too, but 15-18 stops are now practical!")
+
+
+# =============================================================================
+# SECTION 12: COMPLETE RESTAURANT TOUR PLANNER
 # =============================================================================
 
 class RestaurantTourPlanner:
     """Plan optimal routes to visit multiple restaurants."""
 
-    def __init__(self, start_location: Dict[str, Any]):
+    def __init__(self, start_location: Dict[str, Any], walking_speed_kmh: float = 5.0):
         self.start = start_location
         self.restaurants: List[Dict[str, Any]] = []
-        self._matrix: Optional[List[List[float]]] = None
+        self.walking_speed_kmh = walking_speed_kmh
+        self._matrix = build_distance_matrix_from_places([start_location], walking_speed_kmh)
 
     def add_restaurant(self, restaurant: Dict[str, Any]) -> None:
-        """Add a restaurant to the tour."""
+        """
+        Add a restaurant to the tour.
+
+        Only the new restaurant's walking times to the places already in
+        the tour are computed; the rest of the matrix is kept as is.
+        """
+        existing = [self.start] + self.restaurants
+        new_point = (restaurant["lat"], restaurant["lon"])
+        # Same pair order and rounding as from_points (new point = column j)
+        self._matrix.append(_scaled_distances(
+            [(p["lat"], p["lon"]) for p in existing],
+            [new_point] * len(existing),
+            scale=60 / self.walking_speed_kmh,
+            ndigits=1
+        ))
         self.restaurants.append(restaurant)
-        self._matrix = None
 
-    def _get_matrix(self) -> List[List[float]]:
-        """Build or return cached distance matrix."""
-        if self._matrix is None:
-            all_places = [self.start] + self.restaurants
-            self._matrix = build_distance_matrix_from_places(all_places)
+    def remove_restaurant(self, name: str) -> Dict[str, Any]:
+        """
+        Remove the first restaurant with this name and return it.
+
+        The matrix is compacted in place instead of being rebuilt.
+
+        Raises:
+            ValueError: If no restaurant has this name
+        """
+        for i, restaurant in enumerate(self.restaurants):
+            if restaurant["name"] == name:
+                self._matrix.remove(i + 1)  # index 0 is the start
+                return self.restaurants.pop(i)
+        raise ValueError(f"No restaurant named {name!r} in the tour")
+
+    def _get_matrix(self) -> SymmetricMatrix:
+        """Return the distance matrix (kept up to date by add/remove)."""
         return self._matrix
 
     def find_optimal_route(self, return_to_start: bool = False) -> Dict[str, Any]:
@@ -598,16 +1575,28 @@ class RestaurantTourPlanner:
         all_places = [self.start] + self.restaurants
         places_to_visit = list(range(1, len(all_places)))
 
-        if return_to_start:
+        n = len(places_to_visit)
+        if n > BRUTE_FORCE_LIMIT:
+            route, time = find_optimal_route_held_karp(
+                0, places_to_visit, matrix, return_to_start=return_to_start
+            )
+            method = "held_karp"
+            num_checked = n * 2 ** (n - 1)  # DP states
+        elif return_to_start:
             route, time = find_optimal_round_trip(0, places_to_visit, matrix)
+            method = "brute_force"
+            num_checked = math.factorial(n)
         else:
             route, time = find_optimal_route_brute_force(0, places_to_visit, matrix)
+            method = "brute_force"
+            num_checked = math.factorial(n)
 
         return {
             "route_indices": route,
             "route_names": [all_places[i]["name"] for i in route],
             "total_time": round(time, 1),
-            "num_checked": math.factorial(len(places_to_visit)),
+            "num_checked": num_checked,
+            "method": method,
         }
 
     def visualize_route(self, route_indices: List[int]) -> str:
@@ -665,6 +1654,15 @@ def demo_restaurant_planner():
     print(f"Optimal Route: {' → '.join(result_rt['route_names'])}")
     print(f"Total Time: {result_rt['total_time']} minutes")
 
+    print("\n--- Changing the Tour ---")
+    planner.add_restaurant({"name": "🍜 Noodle Nook", "lat": 25.036, "lon": 121.562})
+    print(f"Added Noodle Nook → matrix is now {len(planner._get_matrix())}x{len(planner._get_matrix())}")
+    planner.remove_restaurant("🍔 Burger Barn")
+    print(f"Removed Burger Barn → matrix is now {len(planner._get_matrix())}x{len(planner._get_matrix())}")
+    result = planner.find_optimal_route()
+    print(f"Optimal Route: {' → '.join(result['route_names'])}")
+    print(f"Total Time: {result['total_time']} minutes")
+
 
 # =============================================================================
 # MAIN - RUN ALL DEMOS
@@ -680,8 +1678,12 @@ def run_all_demos():
         ("Brute Force TSP", demo_brute_force),
         ("Round Trip", demo_round_trip),
         ("Benchmark", demo_benchmark),
+        ("Parallel Brute Force", demo_parallel_brute_force),
+        ("Branch and Bound", demo_branch_and_bound),
         ("Haversine Distance", demo_haversine),
         ("Nearest Neighbor", demo_nearest_neighbor),
+        ("Local Search", demo_local_search),
+        ("Held-Karp", demo_held_karp),
         ("Restaurant Planner", demo_restaurant_planner),
     ]
 
@@ -711,9 +1713,13 @@ def run_interactive_menu():
         "5": ("Brute Force TSP", demo_brute_force),
         "6": ("Round Trip", demo_round_trip),
         "7": ("Benchmark", demo_benchmark),
-        "8": ("Haversine Distance", demo_haversine),
-        "9": ("Nearest Neighbor", demo_nearest_neighbor),
-        "10": ("Restaurant Planner", demo_restaurant_planner),
+        "8": ("Parallel Brute Force", demo_parallel_brute_force),
+        "9": ("Branch and Bound", demo_branch_and_bound),
+        "10": ("Haversine Distance", demo_haversine),
+        "11": ("Nearest Neighbor", demo_nearest_neighbor),
+        "12": ("Local Search", demo_local_search),
+        "13": ("Held-Karp", demo_held_karp),
+        "14": ("Restaurant Planner", demo_restaurant_planner),
         "a": ("Run All Demos", run_all_demos),
     }
 
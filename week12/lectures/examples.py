@@ -9,6 +9,8 @@ This module demonstrates:
 - Decorators for cross-cutting concerns
 - The Place class for our Smart City Navigator
 - Rate limiting decorator for API compliance
+- A grid spatial index for fast nearest-place lookups
+- A KD-tree on unit-sphere coordinates for radius queries
 
 Run this file to see all examples in action:
     python examples.py
@@ -17,12 +19,60 @@ Or run with interactive menu:
     python examples.py --interactive
 """
 
+import asyncio
+import heapq
 import math
+import threading
 import time
 from functools import wraps
-from typing import Optional, Tuple, Dict, Any, List
+from typing import Optional, Tuple, Dict, Any, List, Callable, Iterable, Iterator
 from dataclasses import dataclass, field
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+# =============================================================================
+# HELPER: BATCH HAVERSINE
+# =============================================================================
+
+EARTH_RADIUS_KM = 6371
+NUMPY_BATCH_MIN = 64
+
+
+def haversine_batch(
+    origins: List[Tuple[float, float]],
+    destinations: List[Tuple[float, float]]
+) -> List[float]:
+    """
+    Haversine distance in km for each (origins[k], destinations[k]) pair.
+
+    Every distance helper in this file goes through here. Large batches
+    use NumPy when available; small ones (and machines without NumPy) use
+    the plain-Python loop, which returns the same values.
+    """
+    if len(origins) != len(destinations):
+        raise ValueError("origins and destinations must have the same length")
+
+    if NUMPY_AVAILABLE and len(origins) >= NUMPY_BATCH_MIN:
+        p1 = np.radians(np.asarray(origins, dtype=float))
+        p2 = np.radians(np.asarray(destinations, dtype=float))
+        dlat, dlon = p2[:, 0] - p1[:, 0], p2[:, 1] - p1[:, 1]
+        a = np.sin(dlat/2)**2 + np.cos(p1[:, 0]) * np.cos(p2[:, 0]) * np.sin(dlon/2)**2
+        return (EARTH_RADIUS_KM * 2 * np.arcsin(np.sqrt(a))).tolist()
+
+    distances = []
+    for (lat1, lon1), (lat2, lon2) in zip(origins, destinations):
+        lat1, lon1 = math.radians(lat1), math.radians(lon1)
+        lat2, lon2 = math.radians(lat2), math.radians(lon2)
+        dlat, dlon = lat2 - lat1, lon2 - lon1
+        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
+        distances.append(EARTH_RADIUS_KM * 2 * math.asin(math.sqrt(a)))
+    return distances
+
 
 # =============================================================================
 # SECTION 1: BASIC CLASS EXAMPLES
@@ -263,12 +313,7 @@ class PlaceWithClassMethods:
     @staticmethod
     def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         """Calculate haversine distance (static utility)."""
-        R = 6371
-        lat1, lat2 = math.radians(lat1), math.radians(lat2)
-        dlat = lat2 - lat1
-        dlon = math.radians(lon2 - lon1)
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        return R * 2 * math.asin(math.sqrt(a))
+        return haversine_batch([(lat1, lon1)], [(lat2, lon2)])[0]
 
     def __repr__(self):
         return f"Place('{self.name}')"
@@ -424,27 +469,85 @@ def demo_practical_decorators():
 # SECTION 7: RATE LIMIT DECORATOR
 # =============================================================================
 
-def rate_limit(seconds: float = 1.0):
+class TokenBucket:
+    """
+    Thread-safe token bucket: up to `burst` calls go through at once,
+    then calls are spaced to `rate` per second.
+
+    Uses time.monotonic(), so changing the system clock can't break it.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token; return the seconds to wait until it is really ours."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    def wait(self) -> float:
+        """Block until a call is allowed; return the time waited."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire(self) -> float:
+        """Like wait(), but lets other asyncio tasks run meanwhile."""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+# One bucket per host, shared by every function decorated with that host
+_host_buckets: Dict[str, TokenBucket] = {}
+_host_buckets_lock = threading.Lock()
+
+
+def rate_limit(seconds: float = 1.0, burst: int = 1, host: Optional[str] = None):
     """
     Decorator that ensures minimum time between function calls.
 
     Args:
-        seconds: Minimum seconds between calls
+        seconds: Minimum seconds between calls (after the burst is used up)
+        burst: How many calls may run back-to-back before waiting
+        host: Share one limit with every other function using the same host
+              (e.g. all Nominatim calls), instead of one limit per function
+
+    Raises:
+        ValueError: If `host` already has a limit with different settings
     """
-    last_call_time = [0.0]
+    if host is None:
+        bucket = TokenBucket(1 / seconds, burst)
+    else:
+        with _host_buckets_lock:
+            bucket = _host_buckets.get(host)
+            if bucket is None:
+                bucket = _host_buckets[host] = TokenBucket(1 / seconds, burst)
+            elif (bucket.rate, bucket.burst) != (1 / seconds, burst):
+                raise ValueError(
+                    f"Host {host!r} already limited to one call per "
+                    f"{1 / bucket.rate:g}s (burst {bucket.burst}); "
+                    f"got seconds={seconds}, burst={burst}"
+                )
 
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            elapsed = time.time() - last_call_time[0]
-            if elapsed < seconds:
-                wait_time = seconds - elapsed
-                print(f"  Rate limit: waiting {wait_time:.2f}s...")
-                time.sleep(wait_time)
-
-            result = func(*args, **kwargs)
-            last_call_time[0] = time.time()
-            return result
+            delay = bucket.reserve()
+            if delay > 0:
+                print(f"  Rate limit: waiting {delay:.2f}s...")
+                time.sleep(delay)
+            return func(*args, **kwargs)
         return wrapper
     return decorator
 
@@ -471,6 +574,37 @@ def demo_rate_limit():
 
     print(f"\nTotal time: {elapsed:.2f}s (expected ~1.0s with rate limiting)")
 
+    print("\n--- Burst + Shared Host Limit ---")
+
+    @rate_limit(seconds=0.25, burst=2, host="demo-api")
+    def search(query):
+        print(f"  search('{query}')")
+
+    @rate_limit(seconds=0.25, burst=2, host="demo-api")
+    def reverse(lat, lon):
+        print(f"  reverse({lat}, {lon})")
+
+    start = time.time()
+    search("pizza")
+    reverse(25.03, 121.56)  # burst: no wait
+    search("ramen")         # both functions share one bucket, so this waits
+    print(f"Total time: {time.time() - start:.2f}s (expected ~0.25s)")
+
+    print("\n--- Async: 5 Tasks Sharing One Bucket ---")
+
+    bucket = TokenBucket(rate=10, burst=2)
+
+    async def fetch(i: int):
+        await bucket.acquire()
+        return i
+
+    async def fetch_all():
+        return await asyncio.gather(*(fetch(i) for i in range(5)))
+
+    start = time.time()
+    asyncio.run(fetch_all())
+    print(f"Total time: {time.time() - start:.2f}s (expected ~0.3s)")
+
 
 # =============================================================================
 # SECTION 8: THE COMPLETE PLACE CLASS
@@ -525,12 +659,11 @@ class Place:
 
     def distance_to(self, other: 'Place') -> float:
         """Calculate Haversine distance to another Place in km."""
-        R = 6371
-        lat1, lon1 = math.radians(self.lat), math.radians(self.lon)
-        lat2, lon2 = math.radians(other.lat), math.radians(other.lon)
-        dlat, dlon = lat2 - lat1, lon2 - lon1
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        return R * 2 * math.asin(math.sqrt(a))
+        return haversine_batch([self.coords], [other.coords])[0]
+
+    def distances_to(self, others: List['Place']) -> List[float]:
+        """Calculate Haversine distances to many Places in one call (km)."""
+        return haversine_batch([self.coords] * len(others), [o.coords for o in others])
 
     def walking_time_to(self, other: 'Place', speed_kmh: float = 5.0) -> float:
         """Calculate walking time to another Place in minutes."""
@@ -616,6 +749,10 @@ def demo_place_class():
     walk_time = taipei101.walking_time_to(station)
     print(f"Walking time: {walk_time:.1f} minutes")
 
+    print("\n--- Batch Distances ---")
+    for other, d in zip([station, pizza], taipei101.distances_to([station, pizza])):
+        print(f"Taipei 101 → {other.name}: {d:.2f} km")
+
     print("\n--- Serialization ---")
     data = taipei101.to_dict()
     print(f"to_dict(): {data}")
@@ -654,12 +791,7 @@ class DataclassPlace:
         return self.coords[1]
 
     def distance_to(self, other: 'DataclassPlace') -> float:
-        R = 6371
-        lat1, lon1 = math.radians(self.lat), math.radians(self.lon)
-        lat2, lon2 = math.radians(other.lat), math.radians(other.lon)
-        dlat, dlon = lat2 - lat1, lon2 - lon1
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        return R * 2 * math.asin(math.sqrt(a))
+        return haversine_batch([self.coords], [other.coords])[0]
 
 
 def demo_dataclass():
@@ -684,6 +816,479 @@ def demo_dataclass():
     print(f"Distance p1 to p3: {dist:.3f} km")
 
 
+# =============================================================================
+# SECTION 10: SPATIAL INDEX (GRID)
+# =============================================================================
+
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180  # ~111.2 km per degree of latitude
+
+
+class GridIndex:
+    """
+    Spatial index that buckets places into a fixed-degree lat/lon grid.
+
+    Instead of computing the distance to every place, a query only looks
+    at the grid cells around the search point, then runs the exact
+    Haversine formula on the places in those cells.
+
+    Items are Place objects by default; pass `key` to index anything else
+    (it must return a (lat, lon) tuple). Longitude wrap-around at ±180° is
+    not handled, which is fine for city-sized data.
+
+    Example:
+        index = GridIndex(places, cell_size_deg=0.01)   # ~1 km cells
+        index.nearest(25.033, 121.565, k=3)     # [(place, km), ...]
+        index.within(25.033, 121.565, 0.5)      # everything within 500 m
+    """
+
+    def __init__(
+        self,
+        items: Iterable[Any] = (),
+        cell_size_deg: float = 0.01,
+        key: Optional[Callable[[Any], Tuple[float, float]]] = None
+    ):
+        if cell_size_deg <= 0:
+            raise ValueError("cell_size_deg must be positive")
+        self.cell_size_deg = cell_size_deg
+        self._key = key or (lambda item: item.coords)
+        self._cells: Dict[Tuple[int, int], List[Tuple[float, float, Any]]] = {}
+        self._size = 0
+        self._bounds: Optional[List[int]] = None  # [min_row, max_row, min_col, max_col]
+        for item in items:
+            self.add(item)
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_size_deg), math.floor(lon / self.cell_size_deg)
+
+    def add(self, item: Any) -> None:
+        """Add one item to the index."""
+        lat, lon = self._key(item)
+        row, col = self._cell(lat, lon)
+        self._cells.setdefault((row, col), []).append((lat, lon, item))
+        self._size += 1
+        if self._bounds is None:
+            self._bounds = [row, row, col, col]
+        else:
+            b = self._bounds
+            b[0], b[1] = min(b[0], row), max(b[1], row)
+            b[2], b[3] = min(b[2], col), max(b[3], col)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _ring(self, row: int, col: int, r: int) -> Iterator[Tuple[float, float, Any]]:
+        """Yield every entry in the square ring of cells r steps from (row, col)."""
+        cells = self._cells
+        for dr in range(-r, r + 1):
+            step = 1 if abs(dr) == r else 2 * r  # full edge, or just both sides
+            for dc in range(-r, r + 1, step or 1):
+                yield from cells.get((row + dr, col + dc), ())
+
+    def _clearance_km(self, lat: float, lon: float, row: int, col: int, r: int) -> float:
+        """Lower bound on the distance from (lat, lon) to anything outside ring r."""
+        cs = self.cell_size_deg
+        lat_gap = min(lat - (row - r) * cs, (row + r + 1) * cs - lat)
+        lon_gap = min(lon - (col - r) * cs, (col + r + 1) * cs - lon)
+        # Degrees of longitude shrink toward the poles; use the worst case
+        widest_lat = min(90.0, abs(lat) + (r + 1) * cs)
+        lon_scale = max(math.cos(math.radians(widest_lat)), 0.0)
+        return 0.999 * min(lat_gap * KM_PER_DEGREE, lon_gap * KM_PER_DEGREE * lon_scale)
+
+    def nearest(self, lat: float, lon: float, k: int = 1) -> List[Tuple[Any, float]]:
+        """
+        Find the k items closest to (lat, lon).
+
+        Searches ring by ring outward from the point's cell and stops as
+        soon as no unvisited cell could hold anything closer.
+
+        Returns:
+            List of (item, distance_km), closest first
+        """
+        if k <= 0 or not self._size:
+            return []
+
+        row, col = self._cell(lat, lon)
+        min_row, max_row, min_col, max_col = self._bounds
+        last_ring = max(abs(row - min_row), abs(row - max_row),
+                        abs(col - min_col), abs(col - max_col))
+
+        # Rings closer than the data's bounding box are empty; skip them
+        first_ring = max(0, row - max_row, min_row - row, col - max_col, min_col - col)
+
+        best: List[Tuple[float, int, Any]] = []  # max-heap via negated distance
+        counter = 0
+        for r in range(first_ring, last_ring + 1):
+            if 8 * r > len(self._cells):
+                # Sparse data: a ring now has more cells than the index
+                # holds, so scan every remaining occupied cell once instead
+                candidates = [
+                    entry
+                    for (cr, cc), entries in self._cells.items()
+                    if max(abs(cr - row), abs(cc - col)) >= r
+                    for entry in entries
+                ]
+                last_ring = r
+            else:
+                candidates = list(self._ring(row, col, r))
+            if candidates:
+                distances = haversine_batch(
+                    [(lat, lon)] * len(candidates),
+                    [(c[0], c[1]) for c in candidates]
+                )
+                for (_, _, item), dist in zip(candidates, distances):
+                    counter += 1
+                    if len(best) < k:
+                        heapq.heappush(best, (-dist, -counter, item))
+                    elif dist < -best[0][0]:
+                        heapq.heapreplace(best, (-dist, -counter, item))
+
+            if r == last_ring:
+                break
+            if len(best) == k and -best[0][0] <= self._clearance_km(lat, lon, row, col, r):
+                break
+
+        return [(item, -neg_dist) for neg_dist, _, item in sorted(best, reverse=True)]
+
+    def within(self, lat: float, lon: float, radius_km: float) -> List[Tuple[Any, float]]:
+        """
+        Find every item within radius_km of (lat, lon).
+
+        Only cells overlapping the radius' bounding box are checked.
+
+        Returns:
+            List of (item, distance_km), closest first
+        """
+        if not self._size or radius_km < 0:
+            return []
+
+        cs = self.cell_size_deg
+        dlat = radius_km / KM_PER_DEGREE
+        widest_lat = min(90.0, abs(lat) + dlat)
+        lon_scale = math.cos(math.radians(widest_lat))
+        dlon = 360.0 if lon_scale <= 1e-12 else min(360.0, radius_km / (KM_PER_DEGREE * lon_scale))
+
+        min_row, max_row, min_col, max_col = self._bounds
+        row_lo, row_hi = max(min_row, math.floor((lat - dlat) / cs)), min(max_row, math.floor((lat + dlat) / cs))
+        col_lo, col_hi = max(min_col, math.floor((lon - dlon) / cs)), min(max_col, math.floor((lon + dlon) / cs))
+
+        candidates = []
+        if (row_hi - row_lo + 1) * (col_hi - col_lo + 1) > len(self._cells):
+            # Huge radius: cheaper to walk the occupied cells
+            for (r, c), entries in self._cells.items():
+                if row_lo <= r <= row_hi and col_lo <= c <= col_hi:
+                    candidates.extend(entries)
+        else:
+            for r in range(row_lo, row_hi + 1):
+                for c in range(col_lo, col_hi + 1):
+                    candidates.extend(self._cells.get((r, c), ()))
+
+        if not candidates:
+            return []
+        distances = haversine_batch([(lat, lon)] * len(candidates),
+                                    [(c[0], c[1]) for c in candidates])
+        found = [(c[2], d) for c, d in zip(candidates, distances) if d <= radius_km]
+        found.sort(key=lambda pair: pair[1])
+        return found
+
+
+def demo_spatial_index():
+    """Compare a linear scan with the grid spatial index."""
+    print("\n" + "=" * 60)
+    print("DEMO: Spatial Index (Grid)")
+    print("=" * 60)
+
+    import random
+    rng = random.Random(12)
+    places = [
+        Place(f"POI {i}", (24.95 + rng.random() * 0.2, 121.45 + rng.random() * 0.2))
+        for i in range(50_000)
+    ]
+    me = Place("Taipei 101", (25.0330, 121.5654))
+
+    start = time.time()
+    index = GridIndex(places, cell_size_deg=0.005)
+    print(f"\nIndexed {len(index):,} places in {time.time() - start:.2f}s")
+
+    print("\n--- 3 Nearest Places ---")
+    start = time.time()
+    distances = me.distances_to(places)
+    linear = sorted(zip(places, distances), key=lambda pair: pair[1])[:3]
+    linear_time = time.time() - start
+
+    start = time.time()
+    indexed = index.nearest(me.lat, me.lon, k=3)
+    index_time = time.time() - start
+
+    for place, dist in indexed:
+        print(f"  {place.name}: {dist * 1000:.0f} m")
+    print(f"  Linear scan: {linear_time * 1000:.1f} ms, grid index: {index_time * 1000:.2f} ms")
+    print(f"  Same result? {[p for p, _ in linear] == [p for p, _ in indexed]}")
+
+    print("\n--- Everything Within 300 m ---")
+    start = time.time()
+    nearby = index.within(me.lat, me.lon, 0.3)
+    index_time = time.time() - start
+    linear_count = sum(1 for d in distances if d <= 0.3)
+    print(f"  Found {len(nearby)} places in {index_time * 1000:.2f} ms "
+          f"(linear scan finds {linear_count})")
+
+
+# =============================================================================
+# SECTION 11: KD-TREE ON THE UNIT SPHERE
+# =============================================================================
+
+def to_unit_vector(lat: float, lon: float) -> Tuple[float, float, float]:
+    """Convert (lat, lon) in degrees to an (x, y, z) point on the unit sphere."""
+    lat_r, lon_r = math.radians(lat), math.radians(lon)
+    cos_lat = math.cos(lat_r)
+    return cos_lat * math.cos(lon_r), cos_lat * math.sin(lon_r), math.sin(lat_r)
+
+
+def km_to_chord(distance_km: float) -> float:
+    """Great-circle distance (km) → straight-line chord length on the unit sphere."""
+    angle = min(distance_km / EARTH_RADIUS_KM, math.pi)
+    return 2 * math.sin(angle / 2)
+
+
+def chord_to_km(chord: float) -> float:
+    """Chord length on the unit sphere → great-circle distance (km)."""
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+class SphereKDTree:
+    """
+    KD-tree over places stored as 3D points on the unit sphere.
+
+    On a sphere, "within d km" is the same as "straight-line (chord)
+    distance below 2·sin(d / 2R)". So after converting every place to an
+    (x, y, z) unit vector once, radius and nearest-neighbor queries become
+    ordinary 3D box checks with no trig in the inner loop, and they work
+    anywhere on Earth (no special cases at the poles or at ±180°).
+
+    The tree is built in bulk; build a new one when the data changes.
+
+    Example:
+        tree = SphereKDTree(places)
+        tree.query_radius(25.033, 121.565, 0.8)        # [(place, km), ...]
+        tree.query_knn(25.033, 121.565, k=5)
+        tree.query_radius_batch([(25.03, 121.56), (25.05, 121.52)], 0.8)
+    """
+
+    LEAF_SIZE = 16
+
+    def __init__(
+        self,
+        items: Iterable[Any],
+        key: Optional[Callable[[Any], Tuple[float, float]]] = None
+    ):
+        key = key or (lambda item: item.coords)
+        self.items = list(items)
+        self.points = [to_unit_vector(*key(item)) for item in self.items]
+        self._order = list(range(len(self.items)))
+        # Each node: [lo (x, y, z), hi (x, y, z), start, end, left, right]
+        self._root = self._build(0, len(self.items)) if self.items else None
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def _build(self, start: int, end: int) -> list:
+        """Build the subtree for self._order[start:end]."""
+        pts = [self.points[i] for i in self._order[start:end]]
+        lo = tuple(min(p[a] for p in pts) for a in range(3))
+        hi = tuple(max(p[a] for p in pts) for a in range(3))
+        node = [lo, hi, start, end, None, None]
+
+        if end - start > self.LEAF_SIZE:
+            # Split on the widest axis at the median point
+            axis = max(range(3), key=lambda a: hi[a] - lo[a])
+            self._order[start:end] = sorted(self._order[start:end],
+                                            key=lambda i: self.points[i][axis])
+            mid = (start + end) // 2
+            node[4] = self._build(start, mid)
+            node[5] = self._build(mid, end)
+        return node
+
+    @staticmethod
+    def _box_dist_sq(q: Tuple[float, float, float], lo, hi) -> float:
+        """Squared distance from q to the nearest point of a bounding box."""
+        total = 0.0
+        for a in range(3):
+            if q[a] < lo[a]:
+                total += (lo[a] - q[a]) ** 2
+            elif q[a] > hi[a]:
+                total += (q[a] - hi[a]) ** 2
+        return total
+
+    def _radius_from_vector(self, q, radius_km: float,
+                            predicate: Optional[Callable[[Any], bool]]) -> List[Tuple[Any, float]]:
+        if self._root is None:
+            return []
+        limit_sq = km_to_chord(radius_km) ** 2
+        points, order, items = self.points, self._order, self.items
+        found = []
+        stack = [self._root]
+        while stack:
+            lo, hi, start, end, left, right = stack.pop()
+            if self._box_dist_sq(q, lo, hi) > limit_sq:
+                continue
+            if left is not None:
+                stack.append(left)
+                stack.append(right)
+                continue
+            for i in order[start:end]:
+                p = points[i]
+                d_sq = (p[0] - q[0]) ** 2 + (p[1] - q[1]) ** 2 + (p[2] - q[2]) ** 2
+                if d_sq <= limit_sq and (predicate is None or predicate(items[i])):
+                    found.append((items[i], chord_to_km(math.sqrt(d_sq))))
+        found.sort(key=lambda pair: pair[1])
+        return found
+
+    def query_radius(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        predicate: Optional[Callable[[Any], bool]] = None
+    ) -> List[Tuple[Any, float]]:
+        """
+        Find every item within radius_km of (lat, lon).
+
+        Args:
+            lat, lon: Search center
+            radius_km: Great-circle search radius
+            predicate: Optional extra filter, checked only for items inside
+                the radius (e.g. a minimum rating)
+
+        Returns:
+            List of (item, distance_km), closest first
+        """
+        return self._radius_from_vector(to_unit_vector(lat, lon), radius_km, predicate)
+
+    def query_radius_batch(
+        self,
+        centers: List[Tuple[float, float]],
+        radius_km: float,
+        predicate: Optional[Callable[[Any], bool]] = None
+    ) -> List[List[Tuple[Any, float]]]:
+        """Run query_radius for many (lat, lon) centers; one result list per center."""
+        return [self._radius_from_vector(to_unit_vector(lat, lon), radius_km, predicate)
+                for lat, lon in centers]
+
+    def query_knn(
+        self,
+        lat: float,
+        lon: float,
+        k: int = 1,
+        predicate: Optional[Callable[[Any], bool]] = None
+    ) -> List[Tuple[Any, float]]:
+        """
+        Find the k items closest to (lat, lon).
+
+        Visits tree nodes in order of how close their box is to the query,
+        and stops once the next box is farther than the k-th best so far.
+
+        Returns:
+            List of (item, distance_km), closest first
+        """
+        if self._root is None or k <= 0:
+            return []
+        q = to_unit_vector(lat, lon)
+        points, order, items = self.points, self._order, self.items
+
+        best: List[Tuple[float, int]] = []  # max-heap of (-d_sq, index)
+        nodes = [(self._box_dist_sq(q, self._root[0], self._root[1]), 0, self._root)]
+        tie = 1
+        while nodes:
+            box_sq, _, node = heapq.heappop(nodes)
+            if len(best) == k and box_sq > -best[0][0]:
+                break
+            lo, hi, start, end, left, right = node
+            if left is not None:
+                for child in (left, right):
+                    heapq.heappush(nodes, (self._box_dist_sq(q, child[0], child[1]), tie, child))
+                    tie += 1
+                continue
+            for i in order[start:end]:
+                p = points[i]
+                d_sq = (p[0] - q[0]) ** 2 + (p[1] - q[1]) ** 2 + (p[2] - q[2]) ** 2
+                if len(best) < k or d_sq < -best[0][0]:
+                    if predicate is not None and not predicate(items[i]):
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, (-d_sq, i))
+                    else:
+                        heapq.heapreplace(best, (-d_sq, i))
+
+        ranked = sorted((-neg_sq, i) for neg_sq, i in best)
+        return [(items[i], chord_to_km(math.sqrt(d_sq))) for d_sq, i in ranked]
+
+
+def find_best_nearby(
+    tree: SphereKDTree,
+    center: Tuple[float, float],
+    max_km: float,
+    min_rating: float = 4.0
+) -> List[Tuple[Place, float]]:
+    """
+    Highly-rated places within max_km of center, best rating first.
+
+    The tree handles the distance part; the rating check runs afterwards,
+    only on places already inside the radius.
+    """
+    nearby = tree.query_radius(
+        center[0], center[1], max_km,
+        predicate=lambda p: (p.rating or 0) >= min_rating
+    )
+    return sorted(nearby, key=lambda pair: pair[0].rating or 0, reverse=True)
+
+
+def demo_sphere_kdtree():
+    """Demonstrate radius and k-nearest queries with the unit-sphere KD-tree."""
+    print("\n" + "=" * 60)
+    print("DEMO: KD-Tree on the Unit Sphere")
+    print("=" * 60)
+
+    import random
+    rng = random.Random(9)
+    places = [
+        Place(f"POI {i}", (24.95 + rng.random() * 0.2, 121.45 + rng.random() * 0.2),
+              rating=round(rng.uniform(2.5, 5.0), 1))
+        for i in range(50_000)
+    ]
+    me = Place("Taipei 101", (25.0330, 121.5654))
+
+    start = time.time()
+    tree = SphereKDTree(places)
+    print(f"\nBuilt tree for {len(tree):,} places in {time.time() - start:.2f}s")
+
+    print("\n--- Best Within 10 Minutes' Walk (~0.8 km, rating >= 4.8) ---")
+    start = time.time()
+    best = find_best_nearby(tree, me.coords, max_km=0.8, min_rating=4.8)
+    tree_time = time.time() - start
+
+    start = time.time()
+    linear = [(p, d) for p, d in zip(places, me.distances_to(places))
+              if d <= 0.8 and p.rating >= 4.8]
+    linear_time = time.time() - start
+
+    for place, dist in best[:3]:
+        print(f"  {place.name}: {place.rating}★, {dist * 1000:.0f} m")
+    print(f"  {len(best)} matches in {tree_time * 1000:.1f} ms "
+          f"(linear scan: {len(linear)} in {linear_time * 1000:.1f} ms)")
+
+    print("\n--- 3 Nearest ---")
+    for place, dist in tree.query_knn(me.lat, me.lon, k=3):
+        print(f"  {place.name}: {dist * 1000:.0f} m")
+
+    print("\n--- Batch: 100 Centers at Once ---")
+    centers = [(24.95 + rng.random() * 0.2, 121.45 + rng.random() * 0.2) for _ in range(100)]
+    start = time.time()
+    results = tree.query_radius_batch(centers, 0.3)
+    elapsed = time.time() - start
+    total = sum(len(r) for r in results)
+    print(f"  {total:,} places found around 100 centers in {elapsed * 1000:.1f} ms")
+
+
 # =============================================================================
 # MAIN
 # =============================================================================
@@ -701,6 +1306,8 @@ def run_all_demos():
         ("Rate Limit Decorator", demo_rate_limit),
         ("Complete Place Class", demo_place_class),
         ("Dataclasses", demo_dataclass),
+        ("Spatial Index", demo_spatial_index),
+        ("Sphere KD-Tree", demo_sphere_kdtree),
     ]
 
     print("=" * 60)
@@ -732,6 +1339,8 @@ def run_interactive_menu():
         "8": ("Rate Limit Decorator", demo_rate_limit),
         "9": ("Complete Place Class", demo_place_class),
         "10": ("Dataclasses", demo_dataclass),
+        "11": ("Spatial Index", demo_spatial_index),
+        "12": ("Sphere KD-Tree", demo_sphere_kdtree),
         "a": ("Run All", run_all_demos),
     }
 
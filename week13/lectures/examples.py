@@ -125,6 +125,9 @@ PLACES = [
     {"id": 4, "name": "City Museum", "rating": 4.6, "category": "museum"},
 ]
 
+# Index by id so lookups don't scan the whole list
+PLACES_BY_ID = {p["id"]: p for p in PLACES}
+
 @app.route("/")
 def home():
     """API documentation."""
@@ -145,9 +148,9 @@ def get_places():
 @app.route("/api/places/<int:place_id>")
 def get_place(place_id):
     """Return a specific place by ID."""
-    for place in PLACES:
-        if place["id"] == place_id:
-            return jsonify(place)
+    place = PLACES_BY_ID.get(place_id)
+    if place:
+        return jsonify(place)
     return jsonify({"error": "Place not found"}), 404
 
 @app.route("/api/categories")
@@ -584,14 +587,14 @@ from flask import Flask, render_template_string, request, redirect, url_for
 
 app = Flask(__name__)
 
-# In-memory database
-PLACES = [
-    {"id": 1, "name": "Pizza Palace", "rating": 4.5, "category": "restaurant"},
-    {"id": 2, "name": "Burger Barn", "rating": 4.2, "category": "restaurant"},
-    {"id": 3, "name": "Central Park", "rating": 4.8, "category": "park"},
-    {"id": 4, "name": "City Museum", "rating": 4.6, "category": "museum"},
-    {"id": 5, "name": "Coffee Corner", "rating": 4.3, "category": "cafe"},
-]
+# In-memory database, keyed by id so lookups and deletes don't scan
+PLACES = {
+    1: {"id": 1, "name": "Pizza Palace", "rating": 4.5, "category": "restaurant"},
+    2: {"id": 2, "name": "Burger Barn", "rating": 4.2, "category": "restaurant"},
+    3: {"id": 3, "name": "Central Park", "rating": 4.8, "category": "park"},
+    4: {"id": 4, "name": "City Museum", "rating": 4.6, "category": "museum"},
+    5: {"id": 5, "name": "Coffee Corner", "rating": 4.3, "category": "cafe"},
+}
 
 NEXT_ID = 6
 
@@ -770,20 +773,20 @@ SEARCH = """
 """
 
 def get_categories():
-    return list(set(p["category"] for p in PLACES))
+    return list(set(p["category"] for p in PLACES.values()))
 
 @app.route("/")
 def home():
-    top = sorted(PLACES, key=lambda p: p["rating"], reverse=True)[:3]
+    top = sorted(PLACES.values(), key=lambda p: p["rating"], reverse=True)[:3]
     return render_template_string(HOME, base=BASE, top_places=top)
 
 @app.route("/places")
 def places():
     category = request.args.get("category")
     if category:
-        filtered = [p for p in PLACES if p["category"] == category]
+        filtered = [p for p in PLACES.values() if p["category"] == category]
     else:
-        filtered = PLACES
+        filtered = list(PLACES.values())
     return render_template_string(PLACES_PAGE, base=BASE,
                                   places=filtered,
                                   categories=get_categories(),
@@ -791,7 +794,7 @@ def places():
 
 @app.route("/place/<int:place_id>")
 def detail(place_id):
-    place = next((p for p in PLACES if p["id"] == place_id), None)
+    place = PLACES.get(place_id)
     if not place:
         return redirect(url_for("places"))
     return render_template_string(DETAIL, base=BASE, place=place)
@@ -803,24 +806,21 @@ def add():
         name = request.form["name"]
         rating = float(request.form["rating"])
         category = request.form["category"]
-        PLACES.append({"id": NEXT_ID, "name": name, "rating": rating, "category": category})
+        PLACES[NEXT_ID] = {"id": NEXT_ID, "name": name, "rating": rating, "category": category}
         NEXT_ID += 1
         return render_template_string(ADD, base=BASE, message=f"Added {name}!", message_type="success")
     return render_template_string(ADD, base=BASE)
 
 @app.route("/delete/<int:place_id>")
 def delete(place_id):
-    global PLACES
-    place = next((p for p in PLACES if p["id"] == place_id), None)
-    if place:
-        PLACES = [p for p in PLACES if p["id"] != place_id]
+    PLACES.pop(place_id, None)
     return redirect(url_for("places"))
 
 @app.route("/search", methods=["GET", "POST"])
 def search():
     if request.method == "POST":
         query = request.form["query"].lower()
-        results = [p for p in PLACES if query in p["name"].lower()]
+        results = [p for p in PLACES.values() if query in p["name"].lower()]
         return render_template_string(SEARCH, base=BASE, query=request.form["query"], results=results)
     return render_template_string(SEARCH, base=BASE)
 
@@ -8,12 +8,14 @@ Each demo generates an HTML map file that opens in your browser.
 
 Usage:
     python examples.py              # Run demo selection menu
-    python examples.py --demo N     # Run specific demo (1-8)
+    python examples.py --demo N     # Run specific demo (1-9)
     python examples.py --all        # Generate all maps
 """
 
 import sys
 import os
+import math
+import random
 import webbrowser
 import tempfile
 
@@ -556,6 +558,121 @@ def demo_complete_map():
     return output_file
 
 
+# =============================================================================
+# Demo 9: Simplifying Long Routes
+# =============================================================================
+
+METERS_PER_DEGREE = 111_320
+
+
+def zoom_tolerance_m(zoom, lat, pixels=1.0):
+    """
+    Ground distance (meters) covered by `pixels` screen pixels.
+
+    At zoom level z a web-map pixel spans 156543 m × cos(lat) / 2^z, so
+    detail smaller than that can't be seen and needn't be sent.
+    """
+    return pixels * 156543.03392 * math.cos(math.radians(lat)) / 2 ** zoom
+
+
+def simplify_route(coords, tolerance_m, stats=None):
+    """
+    Douglas–Peucker line simplification for [lat, lon] points.
+
+    Keeps the two end points, then repeatedly keeps the point farthest
+    from the current straight segment while it is more than tolerance_m
+    away. Points closer than that are dropped.
+
+    Args:
+        coords: List of [lat, lon] points
+        tolerance_m: Maximum allowed deviation in meters
+        stats: Optional dict, filled with before/after/reduction
+
+    Returns:
+        New, shorter list of [lat, lon] points
+    """
+    n = len(coords)
+    if n < 3 or tolerance_m <= 0:
+        result = list(coords)
+    else:
+        # Project to flat meters around the first point (fine at city scale)
+        kx = METERS_PER_DEGREE * math.cos(math.radians(coords[0][0]))
+        xs = [lon * kx for _, lon in coords]
+        ys = [lat * METERS_PER_DEGREE for lat, _ in coords]
+        tol_sq = tolerance_m ** 2
+
+        keep = [False] * n
+        keep[0] = keep[-1] = True
+        stack = [(0, n - 1)]  # iterative, so long routes can't hit the recursion limit
+        while stack:
+            first, last = stack.pop()
+            ax, ay = xs[first], ys[first]
+            dx, dy = xs[last] - ax, ys[last] - ay
+            seg_sq = dx * dx + dy * dy
+
+            farthest, far_sq = -1, -1.0
+            for i in range(first + 1, last):
+                px, py = xs[i] - ax, ys[i] - ay
+                if seg_sq > 0:
+                    t = max(0.0, min(1.0, (px * dx + py * dy) / seg_sq))
+                    px, py = px - t * dx, py - t * dy
+                d_sq = px * px + py * py
+                if d_sq > far_sq:
+                    farthest, far_sq = i, d_sq
+
+            if far_sq > tol_sq:
+                keep[farthest] = True
+                stack.append((first, farthest))
+                stack.append((farthest, last))
+
+        result = [c for c, k in zip(coords, keep) if k]
+
+    if stats is not None:
+        stats.update({
+            "before": n,
+            "after": len(result),
+            "reduction": 1 - len(result) / n if n else 0.0,
+        })
+    return result
+
+
+def demo_simplify_route():
+    """Demonstrate simplifying a dense route before drawing it."""
+    print("Creating map with a simplified route...")
+
+    # A dense GPS-like track: 5,000 points with small jitter
+    rng = random.Random(14)
+    start, end = (25.0330, 121.5654), (25.0478, 121.5170)
+    route_coords = []
+    for i in range(5000):
+        t = i / 4999
+        lat = start[0] + (end[0] - start[0]) * t + 0.002 * math.sin(t * 12)
+        lon = start[1] + (end[1] - start[1]) * t
+        route_coords.append([lat + rng.gauss(0, 0.00002), lon + rng.gauss(0, 0.00002)])
+
+    zoom = 14
+    tolerance = zoom_tolerance_m(zoom, start[0])
+    stats = {}
+    simplified = simplify_route(route_coords, tolerance, stats)
+    print(f"Tolerance at zoom {zoom}: {tolerance:.1f} m (1 pixel)")
+    print(f"Vertices: {stats['before']:,} → {stats['after']:,} "
+          f"({stats['reduction']:.0%} fewer)")
+
+    m = folium.Map(location=[25.0400, 121.5400], zoom_start=zoom)
+    folium.PolyLine(
+        locations=simplified,
+        color="blue",
+        weight=5,
+        opacity=0.8,
+        popup=f"{stats['after']} of {stats['before']} points"
+    ).add_to(m)
+
+    output_file = "demo9_simplified_route.html"
+    m.save(output_file)
+    print(f"Saved: {output_file} ({os.path.getsize(output_file) / 1024:.0f} KB)")
+    return output_file
+
+
 # =============================================================================
 # Demo Runner
 # =============================================================================
@@ -583,6 +700,7 @@ def run_demo(demo_num, open_browser=True):
         6: ("Shapes", demo_shapes),
         7: ("Layer Control", demo_layer_control),
         8: ("Complete Smart City Map", demo_complete_map),
+        9: ("Simplifying Long Routes", demo_simplify_route),
     }
 
     if demo_num not in demos:
@@ -611,14 +729,14 @@ def run_all_demos():
 
     print_header("Generating All Demo Maps")
 
-    for i in range(1, 9):
+    for i in range(1, 10):
         run_demo(i, open_browser=False)
 
     print("\n" + "=" * 60)
     print("All maps generated!")
     print("=" * 60)
     print("\nGenerated files:")
-    for i in range(1, 9):
+    for i in range(1, 10):
         demos = {
             1: "demo1_basic_map.html",
             2: "demo2_map_tiles.html",
@@ -628,6 +746,7 @@ def run_all_demos():
             6: "demo6_shapes.html",
             7: "demo7_layer_control.html",
             8: "demo8_complete_map.html",
+            9: "demo9_simplified_route.html",
         }
         print(f"  {i}. {demos[i]}")
 
@@ -651,9 +770,10 @@ Available Demos:
   6. Shapes             - Circles, polygons, and more
   7. Layer Control      - Toggle map layers
   8. Complete Map       - Full Smart City Navigator
+  9. Simplify Route     - Fewer route points, smaller HTML
 
 Commands:
-  - Enter a number (1-8) to run that demo
+  - Enter a number (1-9) to run that demo
   - Enter 'all' to generate all demo maps
   - Enter 'q' to quit
 
@@ -662,7 +782,7 @@ Each demo generates an HTML file and opens it in your browser.
 
     while True:
         try:
-            choice = input("\nSelect demo (1-8, 'all', or 'q'): ").strip().lower()
+            choice = input("\nSelect demo (1-9, 'all', or 'q'): ").strip().lower()
 
             if choice == 'q':
                 print("Goodbye!")
@@ -671,10 +791,10 @@ Each demo generates an HTML file and opens it in your browser.
                 run_all_demos()
             elif choice.isdigit():
                 num = int(choice)
-                if 1 <= num <= 8:
+                if 1 <= num <= 9:
                     run_demo(num)
                 else:
-                    print("Please enter a number between 1 and 8")
+                    print("Please enter a number between 1 and 9")
             else:
                 print("Invalid input. Try again.")
 
@@ -14,7 +14,12 @@ Usage:
 
 import sys
 import os
+import math
+import asyncio
+import threading
 import time
+from array import array
+from collections import OrderedDict
 from functools import wraps
 
 # Check for required packages
@@ -22,6 +27,7 @@ MISSING_PACKAGES = []
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
@@ -42,27 +48,301 @@ except ImportError:
     MISSING_PACKAGES.append("flask")
 
 
+# =============================================================================
+# Shared HTTP Session
+# =============================================================================
+
+# One requests.Session for every API helper. Connections stay open between
+# calls (keep-alive), so only the first request to a host pays for the
+# TCP/TLS handshake.
+DEFAULT_TIMEOUT = 10  # seconds
+_session = None
+
+
+def create_session(pool_size: int = 10, user_agent: str = "SmartCityNavigator/1.0 (demo)"):
+    """Create a Session with a bounded connection pool and default headers."""
+    session = requests.Session()
+    session.headers.update({
+        "User-Agent": user_agent,
+        "Accept-Encoding": "gzip, deflate",
+    })
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session():
+    """Return the shared session, creating it on first use."""
+    global _session
+    if _session is None:
+        _session = create_session()
+    return _session
+
+
+def set_session(session) -> None:
+    """Replace the shared session (e.g. with a fake one in tests)."""
+    global _session
+    _session = session
+
+
+def http_get(url: str, params: dict | None = None, headers: dict | None = None,
+             timeout: float = DEFAULT_TIMEOUT):
+    """GET through the shared session, with a default timeout."""
+    return get_session().get(url, params=params, headers=headers, timeout=timeout)
+
+
 # =============================================================================
 # Rate Limiting Decorator
 # =============================================================================
 
-def rate_limit(min_interval=1.0):
-    """Decorator to enforce minimum time between API calls."""
-    last_call = [0.0]
+class TokenBucket:
+    """
+    Thread-safe token bucket: `burst` calls may run back-to-back, then
+    calls are spaced to `rate` per second. Uses the monotonic clock.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token; return the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    def wait(self):
+        """Block until a call is allowed."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire(self):
+        """Async version of wait()."""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+# One bucket per API host, shared by every function that calls it
+_host_buckets = {}
+_host_buckets_lock = threading.Lock()
+
+
+def rate_limit(min_interval=1.0, burst=1, host=None):
+    """
+    Decorator to enforce minimum time between API calls.
+
+    With `host`, all functions decorated with the same host share one
+    limit (e.g. geocode and search_nearby both count against Nominatim).
+    Asking for a different min_interval/burst for a known host raises
+    ValueError instead of silently using the first settings.
+    """
+    if host is None:
+        bucket = TokenBucket(1 / min_interval, burst)
+    else:
+        with _host_buckets_lock:
+            bucket = _host_buckets.get(host)
+            if bucket is None:
+                bucket = _host_buckets[host] = TokenBucket(1 / min_interval, burst)
+            elif (bucket.rate, bucket.burst) != (1 / min_interval, burst):
+                raise ValueError(
+                    f"Host {host!r} already limited to one call per "
+                    f"{1 / bucket.rate:g}s (burst {bucket.burst}); "
+                    f"got min_interval={min_interval}, burst={burst}"
+                )
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            bucket.wait()
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
 
+NOMINATIM_HOST = "nominatim.openstreetmap.org"
+OSRM_HOST = "router.project-osrm.org"
+
+
+def normalize_query(text):
+    """Case-fold and collapse whitespace so equivalent queries share a cache key."""
+    return " ".join(str(text).casefold().split())
+
+
+def memoize(maxsize=256, ttl=3600, key=None):
+    """
+    Decorator that remembers recent results in memory (LRU with expiry).
+
+    Put it above @rate_limit so a cache hit skips the wait entirely.
+    None results are not cached, so failed lookups are retried.
+
+    Args:
+        maxsize: Maximum number of remembered results
+        ttl: Seconds before a result is considered stale
+        key: Function building the cache key from the call's arguments
+    """
     def decorator(func):
+        cache = OrderedDict()  # key -> (expires_at, result)
+        stats = {"hits": 0, "misses": 0}
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            elapsed = time.time() - last_call[0]
-            if elapsed < min_interval:
-                time.sleep(min_interval - elapsed)
+            cache_key = key(*args, **kwargs) if key else (args, tuple(sorted(kwargs.items())))
+            entry = cache.get(cache_key)
+            if entry is not None and time.monotonic() < entry[0]:
+                cache.move_to_end(cache_key)
+                stats["hits"] += 1
+                return entry[1]
+
+            stats["misses"] += 1
             result = func(*args, **kwargs)
-            last_call[0] = time.time()
+            if result is not None:
+                cache[cache_key] = (time.monotonic() + ttl, result)
+                cache.move_to_end(cache_key)
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
             return result
+
+        def cache_info():
+            lookups = stats["hits"] + stats["misses"]
+            return {**stats, "size": len(cache),
+                    "hit_rate": stats["hits"] / lookups if lookups else 0.0}
+
+        wrapper.cache_info = cache_info
         return wrapper
     return decorator
 
 
+# =============================================================================
+# Route Geometry (polyline6, decoded on demand)
+# =============================================================================
+
+def decode_polyline(encoded, precision=6):
+    """Decode an OSRM polyline string into a flat array('d'): lat0, lon0, lat1, ..."""
+    factor = 10 ** precision
+    values = array("d")
+    index = lat = lon = 0
+    while index < len(encoded):
+        for axis in (0, 1):
+            shift = result = 0
+            while True:
+                byte = ord(encoded[index]) - 63
+                index += 1
+                result |= (byte & 0x1f) << shift
+                shift += 5
+                if byte < 0x20:
+                    break
+            delta = ~(result >> 1) if result & 1 else result >> 1
+            if axis == 0:
+                lat += delta
+            else:
+                lon += delta
+        values.append(lat / factor)
+        values.append(lon / factor)
+    return values
+
+
+class RouteGeometry:
+    """
+    Route line kept as OSRM's compact polyline6 string.
+
+    Nothing is decoded until the route is drawn: latlon() returns the
+    [lat, lon] pairs folium wants, lonlat() the GeoJSON order.
+    """
+
+    def __init__(self, encoded, precision=6):
+        self.encoded = encoded
+        self.precision = precision
+        self._packed = None
+
+    def packed(self):
+        if self._packed is None:
+            self._packed = decode_polyline(self.encoded, self.precision)
+        return self._packed
+
+    def latlon(self):
+        v = self.packed()
+        return [[v[k], v[k + 1]] for k in range(0, len(v), 2)]
+
+    def lonlat(self):
+        v = self.packed()
+        return [[v[k + 1], v[k]] for k in range(0, len(v), 2)]
+
+    def __len__(self):
+        if self._packed is not None:
+            return len(self._packed) // 2
+        # Every encoded number ends with a character below chr(0x20 + 63)
+        return sum(1 for ch in self.encoded if ord(ch) < 0x5f) // 2
+
+
+METERS_PER_DEGREE = 111_320
+
+
+def zoom_tolerance_m(zoom, lat, pixels=1.0):
+    """Ground distance (meters) covered by `pixels` screen pixels at a zoom level."""
+    return pixels * 156543.03392 * math.cos(math.radians(lat)) / 2 ** zoom
+
+
+def simplify_route(coords, tolerance_m, stats=None):
+    """
+    Douglas–Peucker simplification for [lat, lon] points.
+
+    Drops points that deviate less than tolerance_m from the simplified
+    line, so the map looks the same but the HTML carries far fewer
+    coordinates. If given, `stats` is filled with before/after/reduction.
+    """
+    n = len(coords)
+    if n < 3 or tolerance_m <= 0:
+        result = list(coords)
+    else:
+        kx = METERS_PER_DEGREE * math.cos(math.radians(coords[0][0]))
+        xs = [lon * kx for _, lon in coords]
+        ys = [lat * METERS_PER_DEGREE for lat, _ in coords]
+        tol_sq = tolerance_m ** 2
+
+        keep = [False] * n
+        keep[0] = keep[-1] = True
+        stack = [(0, n - 1)]
+        while stack:
+            first, last = stack.pop()
+            ax, ay = xs[first], ys[first]
+            dx, dy = xs[last] - ax, ys[last] - ay
+            seg_sq = dx * dx + dy * dy
+
+            farthest, far_sq = -1, -1.0
+            for i in range(first + 1, last):
+                px, py = xs[i] - ax, ys[i] - ay
+                if seg_sq > 0:
+                    t = max(0.0, min(1.0, (px * dx + py * dy) / seg_sq))
+                    px, py = px - t * dx, py - t * dy
+                d_sq = px * px + py * py
+                if d_sq > far_sq:
+                    farthest, far_sq = i, d_sq
+
+            if far_sq > tol_sq:
+                keep[farthest] = True
+                stack.append((first, farthest))
+                stack.append((farthest, last))
+
+        result = [c for c, k in zip(coords, keep) if k]
+
+    if stats is not None:
+        stats.update({
+            "before": n,
+            "after": len(result),
+            "reduction": 1 - len(result) / n if n else 0.0,
+        })
+    return result
+
+
 # =============================================================================
 # Demo 1: Geocoding with Nominatim
 # =============================================================================
@@ -76,7 +356,8 @@ def demo_geocoding():
         print("Error: requests package not installed")
         return None
 
-    @rate_limit(1.0)
+    @memoize(key=normalize_query)
+    @rate_limit(1.0, host=NOMINATIM_HOST)
     def geocode(address):
         """Convert address to coordinates."""
         url = "https://nominatim.openstreetmap.org/search"
@@ -87,7 +368,7 @@ def demo_geocoding():
         }
         headers = {"User-Agent": "SmartCityNavigator/1.0 (demo)"}
 
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = http_get(url, params=params, headers=headers, timeout=10)
         response.raise_for_status()
 
         data = response.json()
@@ -101,11 +382,12 @@ def demo_geocoding():
             "display_name": result["display_name"]
         }
 
-    # Test geocoding
+    # Test geocoding (the last one repeats Taipei 101 and comes from the cache)
     test_locations = [
         "National Taiwan University, Taipei",
         "Taipei 101",
-        "Taipei Main Station"
+        "Taipei Main Station",
+        "taipei  101"
     ]
 
     results = []
@@ -122,6 +404,7 @@ def demo_geocoding():
         except Exception as e:
             print(f"  Error: {e}")
 
+    print(f"\nGeocode cache: {geocode.cache_info()}")
     return results
 
 
@@ -138,7 +421,7 @@ def demo_nearby_search():
         print("Error: requests package not installed")
         return None
 
-    @rate_limit(1.0)
+    @rate_limit(1.0, host=NOMINATIM_HOST)
     def search_nearby(lat, lon, query, radius=1000):
         """Search for places near a location."""
         url = "https://nominatim.openstreetmap.org/search"
@@ -155,7 +438,7 @@ def demo_nearby_search():
         }
         headers = {"User-Agent": "SmartCityNavigator/1.0 (demo)"}
 
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = http_get(url, params=params, headers=headers, timeout=10)
         response.raise_for_status()
 
         data = response.json()
@@ -207,7 +490,7 @@ def demo_routing():
         print("Error: requests package not installed")
         return None
 
-    @rate_limit(0.5)
+    @rate_limit(0.5, host=OSRM_HOST)
     def get_route(start, end, mode="foot"):
         """Get walking route between two points."""
         # OSRM expects lon,lat order
@@ -216,10 +499,10 @@ def demo_routing():
 
         params = {
             "overview": "full",
-            "geometries": "geojson"
+            "geometries": "polyline6"
         }
 
-        response = requests.get(url, params=params, timeout=10)
+        response = http_get(url, params=params, timeout=10)
         response.raise_for_status()
 
         data = response.json()
@@ -229,15 +512,13 @@ def demo_routing():
 
         route = data["routes"][0]
 
-        # Convert coordinates for Folium (lat, lon)
-        geometry = route["geometry"]["coordinates"]
-        route_coords = [[coord[1], coord[0]] for coord in geometry]
-
+        # Keep the encoded line; it is decoded (and flipped to lat, lon
+        # for Folium) only when a map actually draws it
         return {
             "distance_m": route["distance"],
             "duration_s": route["duration"],
             "duration_min": route["duration"] / 60,
-            "geometry": route_coords
+            "geometry": RouteGeometry(route["geometry"])
         }
 
     # Test route from NTU to nearby locations
@@ -400,6 +681,61 @@ def demo_map_generation():
     return output_file
 
 
+# =============================================================================
+# One-to-Many Travel Times (OSRM Table)
+# =============================================================================
+
+@rate_limit(0.5, host=OSRM_HOST)
+def get_travel_times(origin, destinations, mode="foot"):
+    """
+    Get travel time and distance from one origin to many places in ONE request.
+
+    Uses the OSRM /table service with sources=0 and destinations=1..N, so
+    ten candidate places cost a single API call instead of ten /route calls.
+    No geometry is returned; fetch that later with get_route, and only for
+    the places you actually show.
+
+    Args:
+        origin: (lat, lon) tuple
+        destinations: List of (lat, lon) tuples
+        mode: OSRM profile (foot, bike, driving)
+
+    Returns:
+        List with one entry per destination, in the same order:
+        {"duration_min": ..., "distance_m": ...}, or None if unreachable
+        (all None if the request fails)
+    """
+    if not destinations:
+        return []
+
+    points = [origin] + list(destinations)
+    coords = ";".join(f"{lon},{lat}" for lat, lon in points)
+    url = f"http://router.project-osrm.org/table/v1/{mode}/{coords}"
+    params = {
+        "sources": "0",
+        "destinations": ";".join(str(i) for i in range(1, len(points))),
+        "annotations": "duration,distance",
+    }
+
+    response = http_get(url, params=params, timeout=10)
+    if response.status_code != 200:
+        return [None] * len(destinations)  # e.g. 429 or a 5xx HTML page
+    try:
+        data = response.json()
+    except ValueError:
+        return [None] * len(destinations)
+    if data.get("code") != "Ok":
+        return [None] * len(destinations)
+
+    durations = data["durations"][0]
+    distances = data["distances"][0]
+    return [
+        {"duration_min": dur / 60, "distance_m": dist}
+        if dur is not None and dist is not None else None
+        for dur, dist in zip(durations, distances)
+    ]
+
+
 # =============================================================================
 # Demo 6: Complete Integration (without Flask)
 # =============================================================================
@@ -421,13 +757,14 @@ def demo_complete_integration():
     print(f"\nSearching for {category}s near: {location}")
     print(f"Max walking time: {max_time} minutes")
 
-    @rate_limit(1.0)
+    @memoize(key=normalize_query)
+    @rate_limit(1.0, host=NOMINATIM_HOST)
     def geocode(address):
         """Geocode an address."""
         url = "https://nominatim.openstreetmap.org/search"
         params = {"q": address, "format": "json", "limit": 1}
         headers = {"User-Agent": "SmartCityNavigator/1.0 (demo)"}
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = http_get(url, params=params, headers=headers, timeout=10)
         data = response.json()
         if not data:
             return None
@@ -437,7 +774,7 @@ def demo_complete_integration():
             "display_name": data[0]["display_name"]
         }
 
-    @rate_limit(1.0)
+    @rate_limit(1.0, host=NOMINATIM_HOST)
     def search_nearby(lat, lon, query):
         """Search for nearby places."""
         url = "https://nominatim.openstreetmap.org/search"
@@ -450,18 +787,18 @@ def demo_complete_integration():
             "bounded": 1
         }
         headers = {"User-Agent": "SmartCityNavigator/1.0 (demo)"}
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = http_get(url, params=params, headers=headers, timeout=10)
         return [
             {"name": p.get("name", "Unknown"), "lat": float(p["lat"]), "lon": float(p["lon"])}
             for p in response.json()
         ]
 
-    @rate_limit(0.5)
+    @rate_limit(0.5, host=OSRM_HOST)
     def get_route(start, end):
         """Get walking route."""
         coords = f"{start[1]},{start[0]};{end[1]},{end[0]}"
         url = f"http://router.project-osrm.org/route/v1/foot/{coords}"
-        response = requests.get(url, params={"overview": "full", "geometries": "geojson"}, timeout=10)
+        response = http_get(url, params={"overview": "full", "geometries": "polyline6"}, timeout=10)
         data = response.json()
         if data.get("code") != "Ok":
             return None
@@ -469,7 +806,7 @@ def demo_complete_integration():
         return {
             "duration_min": route["duration"] / 60,
             "distance_m": route["distance"],
-            "geometry": [[c[1], c[0]] for c in route["geometry"]["coordinates"]]
+            "geometry": RouteGeometry(route["geometry"])
         }
 
     try:
@@ -486,17 +823,17 @@ def demo_complete_integration():
         places = search_nearby(start["lat"], start["lon"], category)
         print(f"   Found {len(places)} places")
 
-        # Step 3: Get routes
-        print("\n3. Calculating walking routes...")
+        # Step 3: Get walking times for all places in one table request
+        print("\n3. Calculating walking times (one OSRM table call)...")
+        origin = (start["lat"], start["lon"])
+        times = get_travel_times(origin, [(p["lat"], p["lon"]) for p in places])
         places_with_routes = []
-        for place in places:
-            route = get_route((start["lat"], start["lon"]), (place["lat"], place["lon"]))
-            if route:
-                place["duration_min"] = route["duration_min"]
-                place["distance_m"] = route["distance_m"]
-                place["geometry"] = route["geometry"]
+        for place, travel in zip(places, times):
+            if travel:
+                place["duration_min"] = travel["duration_min"]
+                place["distance_m"] = travel["distance_m"]
                 places_with_routes.append(place)
-                print(f"   - {place['name']}: {route['duration_min']:.1f} min")
+                print(f"   - {place['name']}: {travel['duration_min']:.1f} min")
 
         # Step 4: Filter
         print(f"\n4. Filtering by max {max_time} min walk...")
@@ -507,13 +844,23 @@ def demo_complete_integration():
         print("\n5. Sorting by walking time...")
         filtered.sort(key=lambda p: p["duration_min"])
 
+        # Route geometry only for the places that made the cut
+        for place in filtered:
+            route = get_route(origin, (place["lat"], place["lon"]))
+            if route:
+                place["geometry"] = route["geometry"]
+
         # Step 6: Generate map
         print("\n6. Generating map...")
+        zoom = 15
         m = folium.Map(
             location=[start["lat"], start["lon"]],
-            zoom_start=15,
+            zoom_start=zoom,
             tiles="CartoDB positron"
         )
+        # Route detail finer than one pixel at this zoom is invisible
+        tolerance = zoom_tolerance_m(zoom, start["lat"])
+        points_before = points_after = 0
 
         # Start marker
         folium.Marker(
@@ -525,8 +872,12 @@ def demo_complete_integration():
         # Place markers and routes
         for i, place in enumerate(filtered, 1):
             if "geometry" in place:
+                stats = {}
+                line = simplify_route(place["geometry"].latlon(), tolerance, stats)
+                points_before += stats["before"]
+                points_after += stats["after"]
                 folium.PolyLine(
-                    place["geometry"],
+                    line,
                     color="orange",
                     weight=4,
                     opacity=0.7
@@ -539,6 +890,10 @@ def demo_complete_integration():
                 icon=folium.Icon(color="orange", icon="coffee", prefix="fa")
             ).add_to(m)
 
+        if points_before:
+            print(f"   Route points: {points_before} → {points_after} "
+                  f"({1 - points_after / points_before:.0%} fewer)")
+
         output_file = "demo6_complete.html"
         m.save(output_file)
         print(f"\nMap saved to: {output_file}")
@@ -783,7 +1138,7 @@ def demo_error_handling():
             params = {"q": address, "format": "json", "limit": 1}
             headers = {"User-Agent": "SmartCityNavigator/1.0 (demo)"}
 
-            response = requests.get(url, params=params, headers=headers, timeout=5)
+            response = http_get(url, params=params, headers=headers, timeout=5)
             response.raise_for_status()
 
             data = response.json()